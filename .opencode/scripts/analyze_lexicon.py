@@ -1,32 +1,283 @@
-import collections
+"""
+Lexicon analysis for Giuzu training text.
+
+Default run: top words and bigrams of the cleaned WhatsApp dump.
+
+  python3 .opencode/scripts/analyze_lexicon.py [files...] [--n 3] [--top 20] [--jobs 4]
+  python3 .opencode/scripts/analyze_lexicon.py --json --pmi
+  python3 .opencode/scripts/analyze_lexicon.py big_corpus/*.txt --sketch
+
+Files are streamed line by line and split into byte shards that are counted
+in parallel and merged in order (n-grams crossing a shard boundary are stitched
+back in by the reducer, so exact counts match a single pass). --sketch swaps
+the exact Counters for a Count-Min Sketch plus a pruned heavy-hitter candidate
+list per n, keeping memory bounded for corpora with huge vocabularies; counts
+are then estimates (never under the true count).
+"""
+
 import re
+import os
+import json
+import math
+import zlib
+import argparse
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ingest', 'whatsapp_g_clean.txt')
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+MIN_WORD_LENGTH = 3
+
+# Common stop words to exclude (expanded)
+STOP_WORDS = frozenset([
+    'the', 'and', 'to', 'a', 'of', 'in', 'is', 'it', 'you', 'that', 'for', 'on', 'with', 'this', 'be',
+    'are', 'not', 'have', 'i', 'but', 'so', 'we', 'can', 'if', 'my', 'your', 'me', 'do', 'as', 'at',
+    'or', 'up', 'just', 'like', 'what', 'ok', 'no', 'yes', 'yeah',
+])
+
+SHARD_BYTES = 8 * 1024 * 1024
+SKETCH_WIDTH = 1 << 18
+SKETCH_DEPTH = 5
+HEAVY_HITTER_FACTOR = 50   # candidates kept per n = top * factor
+MIN_PMI_COUNT = 3          # rarer n-grams get wild PMI scores; skip them
+
+
+def iter_tokens(file_path, start=0, end=None):
+    """Yield filtered, lowercased tokens from the lines in [start, end) of a file"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        pos = start
+        for raw in f:
+            if end is not None and pos >= end:
+                break
+            pos += len(raw)
+            for w in TOKEN_PATTERN.findall(raw.decode('utf-8', errors='replace').lower()):
+                if w not in STOP_WORDS and len(w) >= MIN_WORD_LENGTH:
+                    yield w
+
+
+def plan_shards(file_path, shard_bytes=SHARD_BYTES):
+    """Split a file into (path, start, end) byte ranges that end on line boundaries"""
+    size = os.path.getsize(file_path)
+    shards = []
+    start = 0
+    with open(file_path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + shard_bytes, size))
+            f.readline()
+            end = f.tell() if start + shard_bytes < size else size
+            shards.append((file_path, start, end))
+            start = end
+    return shards
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimates; mergeable by adding tables"""
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = array('q', bytes(8 * width * depth))
+
+    def _cells(self, key):
+        data = key.encode('utf-8')
+        return [row * self.width + zlib.crc32(data, row * 0x9E3779B1 & 0xFFFFFFFF) % self.width
+                for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        for cell in self._cells(key):
+            self.table[cell] += count
+
+    def estimate(self, key):
+        return min(self.table[cell] for cell in self._cells(key))
+
+    def merge(self, other):
+        for i, value in enumerate(other.table):
+            if value:
+                self.table[i] += value
+
+
+class ExactCounts:
+    """Per-n Counters keyed by space-joined n-grams"""
+
+    def __init__(self, max_n):
+        self.counts = {n: Counter() for n in range(1, max_n + 1)}
+
+    def add(self, n, key, count=1):
+        self.counts[n][key] += count
+
+    def merge(self, other):
+        for n, counter in other.counts.items():
+            self.counts[n].update(counter)
+
+    def count(self, n, key):
+        return self.counts[n][key]
+
+    def candidates(self, n):
+        return self.counts[n]
+
+
+class SketchCounts:
+    """Count-Min Sketch shared by all n, plus a pruned candidate Counter per n"""
+
+    def __init__(self, max_n, capacity):
+        self.sketch = CountMinSketch()
+        self.capacity = capacity
+        self.heavy = {n: Counter() for n in range(1, max_n + 1)}
+
+    def add(self, n, key, count=1):
+        self.sketch.add(key, count)
+        heavy = self.heavy[n]
+        heavy[key] += count
+        if len(heavy) > 2 * self.capacity:
+            self.heavy[n] = Counter(dict(heavy.most_common(self.capacity)))
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        for n, heavy in other.heavy.items():
+            self.heavy[n].update(heavy)
+
+    def count(self, n, key):
+        return self.sketch.estimate(key)
+
+    def candidates(self, n):
+        # Rank the union of shard candidates by their merged estimates
+        return Counter({key: self.sketch.estimate(key) for key in self.heavy[n]})
+
+
+def new_counts(max_n, sketch_capacity=None):
+    return SketchCounts(max_n, sketch_capacity) if sketch_capacity else ExactCounts(max_n)
+
+
+def _count_shard(args):
+    """Worker: count 1..max_n-grams in one shard, returning edge tokens for stitching"""
+    file_path, start, end, max_n, sketch_capacity = args
+    counts = new_counts(max_n, sketch_capacity)
+    window = deque(maxlen=max_n)
+    head = []
+    total = 0
+    for w in iter_tokens(file_path, start, end):
+        total += 1
+        if len(head) < max_n - 1:
+            head.append(w)
+        window.append(w)
+        counts.add(1, w)
+        grams = list(window)
+        for n in range(2, len(grams) + 1):
+            counts.add(n, ' '.join(grams[-n:]))
+    tail = list(window)[-(max_n - 1):] if max_n > 1 else []
+    return {'counts': counts, 'head': head, 'tail': tail, 'total': total}
+
+
+def _reduce_shards(work, results, max_n, sketch_capacity):
+    merged = new_counts(max_n, sketch_capacity)
+    total = 0
+    carry = []
+    current_file = None
+    for (path, *_), shard in zip(work, results):
+        if path != current_file:
+            # n-grams never span files
+            current_file, carry = path, []
+        # n-grams that start in earlier shards and end in this one
+        joined = carry + shard['head']
+        for n in range(2, max_n + 1):
+            for i in range(max(0, len(carry) - n + 1), len(carry)):
+                if i + n <= len(joined):
+                    merged.add(n, ' '.join(joined[i:i + n]))
+        merged.merge(shard['counts'])
+        total += shard['total']
+        if max_n > 1:
+            carry = (joined if shard['total'] < max_n - 1 else shard['tail'])[-(max_n - 1):]
+    return merged, total
+
+
+def count_ngrams(files, max_n=2, jobs=None, sketch_capacity=None):
+    """Map shards across processes, then reduce in stream order. Returns (counts, total_tokens)"""
+    work = [(path, start, end, max_n, sketch_capacity)
+            for path in files for path, start, end in plan_shards(path)]
+    if jobs == 1 or len(work) <= 1:
+        return _reduce_shards(work, map(_count_shard, work), max_n, sketch_capacity)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return _reduce_shards(work, pool.map(_count_shard, work), max_n, sketch_capacity)
+
+
+def pmi(counts, n, key, count, total):
+    """Pointwise mutual information of an n-gram vs. its words occurring independently"""
+    denominator = 1
+    for w in key.split(' '):
+        denominator *= counts.count(1, w)
+    if not denominator or not total:
+        return 0.0
+    return math.log2(count * total ** (n - 1) / denominator)
+
+
+def build_report(files, max_n=2, top=20, jobs=None, sketch=False, min_count=MIN_PMI_COUNT):
+    capacity = top * HEAVY_HITTER_FACTOR if sketch else None
+    counts, total = count_ngrams(files, max_n, jobs, capacity)
+    report = {
+        'files': [str(f) for f in files],
+        'mode': 'sketch' if sketch else 'exact',
+        'tokens': total,
+        'words': [{'word': w, 'count': c} for w, c in counts.candidates(1).most_common(top)],
+        'phrases': {},
+        'collocations': {},
+    }
+    for n in range(2, max_n + 1):
+        candidates = counts.candidates(n)
+        report['phrases'][str(n)] = [
+            {'phrase': key, 'count': c, 'pmi': round(pmi(counts, n, key, c, total), 3)}
+            for key, c in candidates.most_common(top)
+        ]
+        scored = [(pmi(counts, n, key, c, total), key, c) for key, c in candidates.items() if c >= min_count]
+        scored.sort(key=lambda s: (-s[0], -s[2]))
+        report['collocations'][str(n)] = [
+            {'phrase': key, 'count': c, 'pmi': round(score, 3)} for score, key, c in scored[:top]
+        ]
+    return report
+
+
+def print_report(report, top, show_pmi=False):
+    print(f"=== TOP {top} WORDS ===")
+    for item in report['words']:
+        print(f"{item['word']}: {item['count']}")
+
+    for n, phrases in report['phrases'].items():
+        label = 'Bigrams' if n == '2' else f"{n}-grams"
+        print(f"\n=== TOP {top} PHRASES ({label}) ===")
+        for item in phrases:
+            print(f"{item['phrase']}: {item['count']}")
+
+    if show_pmi:
+        for n, phrases in report['collocations'].items():
+            print(f"\n=== TOP {top} COLLOCATIONS ({n}-grams, PMI) ===")
+            for item in phrases:
+                print(f"{item['phrase']}: {item['pmi']:.2f} ({item['count']})")
+
 
 def analyze_text(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        text = f.read().lower()
-
-    # Tokenize (simple)
-    words = re.findall(r'\b\w+\b', text)
-    
-    # Common stop words to exclude (expanded)
-    stop_words = set(['the', 'and', 'to', 'a', 'of', 'in', 'is', 'it', 'you', 'that', 'for', 'on', 'with', 'this', 'be', 'are', 'not', 'have', 'i', 'but', 'so', 'we', 'can', 'if', 'my', 'your', 'me', 'do', 'as', 'at', 'or', 'up', 'just', 'like', 'what', 'ok', 'no', 'yes', 'yeah'])
-    
-    filtered_words = [w for w in words if w not in stop_words and len(w) > 2]
-    
-    # 2-grams (phrases)
-    bigrams = zip(filtered_words, filtered_words[1:])
-    bigram_counts = collections.Counter(bigrams)
-    
-    # Word frequency
-    word_counts = collections.Counter(filtered_words)
-    
-    print("=== TOP 20 WORDS ===")
-    for w, c in word_counts.most_common(20):
-        print(f"{w}: {c}")
-        
-    print("\n=== TOP 20 PHRASES (Bigrams) ===")
-    for b, c in bigram_counts.most_common(20):
-        print(f"{b[0]} {b[1]}: {c}")
+    print_report(build_report([file_path]), 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Top words, phrases and collocations of a text corpus')
+    parser.add_argument('files', nargs='*', default=[DEFAULT_FILE])
+    parser.add_argument('--n', type=int, default=2, help='longest n-gram to count (default: 2)')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--sketch', action='store_true', help='bounded-memory approximate counts')
+    parser.add_argument('--min-count', type=int, default=MIN_PMI_COUNT, help='minimum count for PMI ranking')
+    parser.add_argument('--pmi', action='store_true', help='also print PMI-ranked collocations')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    report = build_report(args.files, max(1, args.n), args.top, args.jobs, args.sketch, args.min_count)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.top, args.pmi)
+
 
 if __name__ == "__main__":
-    analyze_text(".opencode/ingest/whatsapp_g_clean.txt")
+    main()
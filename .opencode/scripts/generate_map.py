@@ -2,50 +2,351 @@
 """
 🗺️ KNOWLEDGE MAPPER
 Generates a structural map of the ecosystem for the agents to understand context.
+
+Usage:
+  python3 generate_map.py            # Incremental update of knowledge_map.json
+  python3 generate_map.py --sizes    # Also record file size + mtime
+  python3 generate_map.py --hashes   # Also record file content hashes (implies --sizes)
+  python3 generate_map.py --full     # Ignore the previous map and rescan everything
+  python3 generate_map.py --no-index # Skip the SQLite symbol index
+  python3 generate_map.py --query <name>   # Where is <name> defined?
+
+Directory nodes carry their mtime. A directory whose mtime matches the
+previous map has not had entries added, removed or renamed, so its listing is
+reused instead of rescanned; only its subdirectories are stat'ed and
+descended into. With --sizes/--hashes, files are re-stat'ed and only rehashed
+when their size or mtime changed.
+
+Alongside the JSON tree, every mapped file is indexed into knowledge_index.db
+(SQLite): a `files` table (path, type, size, mtime) and a `symbols` table of
+top-level definitions (Python defs/classes via ast, markdown headings,
+TypeScript exports), searchable through an FTS5 table. Only files whose size
+or mtime changed are re-extracted, in parallel.
 """
 
 import os
+import re
+import ast
+import sys
 import json
+import sqlite3
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent.parent
 OUTPUT_FILE = ROOT / '.opencode' / 'data' / 'knowledge_map.json'
 
 EXCLUDE_DIRS = {'.git', 'node_modules', '.venv', '__pycache__', '.DS_Store', 'dist', 'build'}
+MAP_EXTENSIONS = ('.md', '.ts', '.py', '.json')
+MAP_VERSION = 2
+HASH_CHUNK = 1024 * 1024
+
+INDEX_FILE = ROOT / '.opencode' / 'data' / 'knowledge_index.db'
+FILE_TYPES = {'.py': 'python', '.md': 'markdown', '.ts': 'typescript', '.json': 'json'}
+PARALLEL_EXTRACT_MIN = 64   # below this many changed files a process pool is not worth it
+MAX_EXTRACT_BYTES = 2 * 1024 * 1024
+MD_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+TS_EXPORT = re.compile(
+    r'^\s*export\s+(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?'
+    r'(function\*?|class|interface|type|enum|const|let|var|namespace)\s+([A-Za-z_$][\w$]*)'
+)
+TS_EXPORT_LIST = re.compile(r'^\s*export\s*\{([^}]*)\}')
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
 
-def generate_map():
-    tree = {"name": "ROOT", "type": "directory", "children": []}
-    
-    for root, dirs, files in os.walk(ROOT):
-        # Filter dirs
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        
-        path = Path(root)
-        relative = path.relative_to(ROOT)
-        
-        if str(relative) == ".":
-            node = tree
+def load_previous_map(options):
+    """Previous map indexed as {relative path: node}, or {} if unusable"""
+    if not OUTPUT_FILE.exists():
+        return {}
+    try:
+        tree = json.loads(OUTPUT_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if tree.get('version') != MAP_VERSION or tree.get('options') != options:
+        return {}
+    index = {}
+    stack = [('', tree)]
+    while stack:
+        rel, node = stack.pop()
+        index[rel] = node
+        for child in node.get('children', []):
+            stack.append((f"{rel}/{child['name']}" if rel else child['name'], child))
+    return index
+
+
+def file_node(path, rel, cached, options):
+    node = {'name': path.name, 'type': 'file'}
+    if not options['sizes']:
+        return node
+    st = path.stat()
+    node['size'] = st.st_size
+    node['mtime'] = st.st_mtime_ns
+    if options['hashes']:
+        prev = cached.get(rel)
+        if prev and prev.get('size') == st.st_size and prev.get('mtime') == st.st_mtime_ns and 'hash' in prev:
+            node['hash'] = prev['hash']
         else:
-            # Find parent node
-            parts = relative.parts
-            node = tree
-            for part in parts:
-                found = next((c for c in node["children"] if c["name"] == part), None)
-                if not found:
-                    found = {"name": part, "type": "directory", "children": []}
-                    node["children"].append(found)
-                node = found
-        
-        # Add files
-        for f in files:
-            if f in EXCLUDE_DIRS: continue
-            if f.endswith('.md') or f.endswith('.ts') or f.endswith('.py') or f.endswith('.json'):
-                node["children"].append({"name": f, "type": "file"})
-
-    # Save
+            node['hash'] = file_hash(path)
+    return node
+
+
+def list_directory(path):
+    """(file names, subdirectory names) in scandir order"""
+    files, dirs = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name in EXCLUDE_DIRS:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.name)
+            elif not entry.is_dir() and entry.name.endswith(MAP_EXTENSIONS):
+                files.append(entry.name)
+    return files, dirs
+
+
+def scan_directory(path, rel, mtime, cached, options, stats):
+    prev = cached.get(rel)
+    if prev is not None and prev.get('mtime') == mtime:
+        # Same entries as last time: reuse the listing
+        files = [c['name'] for c in prev['children'] if c['type'] == 'file']
+        dirs = [c['name'] for c in prev['children'] if c['type'] == 'directory']
+        stats['reused'] += 1
+    else:
+        files, dirs = list_directory(path)
+        stats['scanned'] += 1
+
+    children = []
+    for name in files:
+        child_rel = f"{rel}/{name}" if rel else name
+        try:
+            children.append(file_node(path / name, child_rel, cached, options))
+        except FileNotFoundError:
+            continue
+    for name in dirs:
+        child_path = path / name
+        try:
+            child_mtime = child_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        child_rel = f"{rel}/{name}" if rel else name
+        children.append(scan_directory(child_path, child_rel, child_mtime, cached, options, stats))
+
+    return {'name': path.name if rel else 'ROOT', 'type': 'directory', 'mtime': mtime, 'children': children}
+
+
+def generate_map(sizes=False, hashes=False, full=False):
+    options = {'sizes': sizes or hashes, 'hashes': hashes}
+    cached = {} if full else load_previous_map(options)
+    stats = {'scanned': 0, 'reused': 0}
+
+    tree = scan_directory(ROOT, '', ROOT.stat().st_mtime_ns, cached, options, stats)
+    tree['version'] = MAP_VERSION
+    tree['options'] = options
+
+    # Save (atomically, so readers never see a half-written map)
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_FILE.write_text(json.dumps(tree, indent=2))
-    print(f"✅ Knowledge Map generated: {OUTPUT_FILE}")
+    tmp = OUTPUT_FILE.with_suffix('.json.tmp')
+    tmp.write_text(json.dumps(tree, separators=(',', ':')))
+    tmp.replace(OUTPUT_FILE)
+    print(f"✅ Knowledge Map generated: {OUTPUT_FILE} "
+          f"({stats['scanned']} directories scanned, {stats['reused']} unchanged)")
+    return tree
+
+
+def iter_files(tree, rel=''):
+    """Relative paths of every file node in a map"""
+    for child in tree.get('children', []):
+        child_rel = f"{rel}/{child['name']}" if rel else child['name']
+        if child['type'] == 'file':
+            yield child_rel
+        else:
+            yield from iter_files(child, child_rel)
+
+
+def python_symbols(text):
+    try:
+        module = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    kinds = {ast.FunctionDef: 'function', ast.AsyncFunctionDef: 'function', ast.ClassDef: 'class'}
+    return [(node.name, kinds[type(node)], node.lineno) for node in module.body if type(node) in kinds]
+
+
+def markdown_symbols(text):
+    symbols = []
+    in_fence = False
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else MD_HEADING.match(line)
+        if match:
+            symbols.append((match.group(2), f"h{len(match.group(1))}", lineno))
+    return symbols
+
+
+def typescript_symbols(text):
+    symbols = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        match = TS_EXPORT.match(line)
+        if match:
+            symbols.append((match.group(2), match.group(1).rstrip('*'), lineno))
+            continue
+        match = TS_EXPORT_LIST.match(line)
+        if match:
+            for item in match.group(1).split(','):
+                name = item.split(' as ')[-1].strip()
+                if name:
+                    symbols.append((name, 'export', lineno))
+    return symbols
+
+
+SYMBOL_EXTRACTORS = {'python': python_symbols, 'markdown': markdown_symbols, 'typescript': typescript_symbols}
+
+
+def _extract_symbols(args):
+    """Worker: (rel, type) -> (rel, [(name, kind, line), ...])"""
+    rel, file_type = args
+    extractor = SYMBOL_EXTRACTORS.get(file_type)
+    path = ROOT / rel
+    if extractor is None or path.stat().st_size > MAX_EXTRACT_BYTES:
+        return rel, []
+    try:
+        text = path.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return rel, []
+    return rel, extractor(text)
+
+
+def has_fts5(conn):
+    try:
+        conn.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+        conn.execute('DROP TABLE temp.fts5_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def open_index(path=None):
+    path = INDEX_FILE if path is None else path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY, type TEXT, size INTEGER, mtime INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS symbols (
+            id INTEGER PRIMARY KEY, path TEXT NOT NULL, name TEXT NOT NULL, kind TEXT, line INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS symbols_path ON symbols(path);
+    """)
+    if has_fts5(conn):
+        conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5(name, kind, path UNINDEXED)')
+    return conn
+
+
+def _has_table(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def build_index(tree, full=False, jobs=None):
+    """Sync knowledge_index.db with the files in the map; returns (changed, removed)"""
+    index_file = INDEX_FILE
+    conn = open_index(index_file)
+    fts = _has_table(conn, 'symbols_fts')
+    if full:
+        conn.execute('DELETE FROM files')
+        conn.execute('DELETE FROM symbols')
+        if fts:
+            conn.execute('DELETE FROM symbols_fts')
+    known = {path: (size, mtime) for path, size, mtime in conn.execute('SELECT path, size, mtime FROM files')}
+
+    current = {}
+    for rel in iter_files(tree):
+        try:
+            st = (ROOT / rel).stat()
+        except FileNotFoundError:
+            continue
+        current[rel] = (st.st_size, st.st_mtime_ns)
+    changed = [rel for rel, stamp in current.items() if known.get(rel) != stamp]
+    removed = [rel for rel in known if rel not in current]
+
+    work = [(rel, FILE_TYPES.get(Path(rel).suffix, 'other')) for rel in changed]
+    if len(work) < PARALLEL_EXTRACT_MIN or jobs == 1:
+        extracted = list(map(_extract_symbols, work))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            extracted = list(pool.map(_extract_symbols, work, chunksize=16))
+
+    with conn:
+        for rel in removed + changed:
+            if fts:
+                conn.execute('DELETE FROM symbols_fts WHERE rowid IN (SELECT id FROM symbols WHERE path = ?)', (rel,))
+            conn.execute('DELETE FROM symbols WHERE path = ?', (rel,))
+        conn.executemany('DELETE FROM files WHERE path = ?', [(rel,) for rel in removed])
+        conn.executemany(
+            'INSERT OR REPLACE INTO files (path, type, size, mtime) VALUES (?, ?, ?, ?)',
+            [(rel, file_type, *current[rel]) for rel, file_type in work],
+        )
+        for rel, symbols in extracted:
+            for name, kind, line in symbols:
+                cur = conn.execute('INSERT INTO symbols (path, name, kind, line) VALUES (?, ?, ?, ?)',
+                                   (rel, name, kind, line))
+                if fts:
+                    conn.execute('INSERT INTO symbols_fts (rowid, name, kind, path) VALUES (?, ?, ?, ?)',
+                                 (cur.lastrowid, name, kind, rel))
+    conn.close()
+    print(f"✅ Symbol index updated: {index_file} ({len(changed)} files re-indexed, {len(removed)} removed)")
+    return changed, removed
+
+
+def find_symbol(name, limit=50):
+    """Exact (case-insensitive) definitions of name, falling back to a full-text prefix search"""
+    conn = open_index()
+    rows = conn.execute(
+        'SELECT path, line, kind, name FROM symbols WHERE name = ? COLLATE NOCASE ORDER BY path, line LIMIT ?',
+        (name, limit),
+    ).fetchall()
+    if not rows and _has_table(conn, 'symbols_fts'):
+        terms = ' '.join('"' + t.replace('"', '""') + '"*' for t in re.findall(r'\w+', name))
+        if terms:
+            rows = conn.execute(
+                'SELECT s.path, s.line, s.kind, s.name FROM symbols_fts f JOIN symbols s ON s.id = f.rowid '
+                'WHERE symbols_fts MATCH ? ORDER BY rank LIMIT ?',
+                (f"name : ({terms})", limit),
+            ).fetchall()
+    conn.close()
+    return rows
+
+
+def main():
+    if '--query' in sys.argv:
+        idx = sys.argv.index('--query')
+        if idx + 1 >= len(sys.argv):
+            print("Usage: generate_map.py --query <name>")
+            sys.exit(1)
+        rows = find_symbol(sys.argv[idx + 1])
+        if not rows:
+            print(f"❌ No definition found for '{sys.argv[idx + 1]}'")
+            sys.exit(1)
+        for path, line, kind, name in rows:
+            print(f"{path}:{line}  {kind} {name}")
+        return
+
+    full = '--full' in sys.argv
+    tree = generate_map(sizes='--sizes' in sys.argv, hashes='--hashes' in sys.argv, full=full)
+    if '--no-index' not in sys.argv:
+        build_index(tree, full=full)
+
 
 if __name__ == "__main__":
-    generate_map()
+    main()
@@ -4,14 +4,20 @@
 Watches giuzu-training/journal.md for new entries and updates identity.md
 
 Usage:
-  python3 .opencode/scripts/giuzu_evolve.py --watch   # Continuous mode
-  python3 .opencode/scripts/giuzu_evolve.py --once    # Single sync
+  python3 .opencode/scripts/giuzu_evolve.py --watch         # Continuous mode (journal only)
+  python3 .opencode/scripts/giuzu_evolve.py --watch --all   # React to any giuzu-training file
+  python3 .opencode/scripts/giuzu_evolve.py --once          # Single sync
 """
 
 import os
 import sys
 import re
+import json
 import time
+import select
+import struct
+import ctypes
+import ctypes.util
 import hashlib
 from pathlib import Path
 from datetime import datetime
@@ -20,9 +26,22 @@ from datetime import datetime
 GIUZU_DIR = Path(__file__).parent.parent / 'giuzu-training'
 JOURNAL_PATH = GIUZU_DIR / 'journal.md'
 IDENTITY_PATH = GIUZU_DIR / 'identity.md'
+IDENTITY_LOG_PATH = GIUZU_DIR / 'identity_updates.json'
 BRAIN_PATH = GIUZU_DIR / 'brain.md'
 PERSONALITY_PATH = GIUZU_DIR / 'personality_matrix.md'
-WATCH_INTERVAL = 30  # seconds
+STATE_PATH = Path(__file__).parent.parent / 'data' / 'giuzu_evolve_state.json'
+WATCH_INTERVAL = 2  # seconds between stat() checks when inotify is unavailable
+DEBOUNCE_SECONDS = 0.5  # quiet period that ends a burst of writes
+SIGNAL_HISTORY = 20  # most recent skills/preferences/lessons kept in the sync state
+CHECKPOINT_PROBE = 256  # bytes before the checkpoint hashed to detect journal rewrites
+MAX_RENDERED_UPDATES = 7  # auto-evolution blocks shown in identity.md (full history stays in the log)
+
+AUTO_START = '<!-- auto-evolution:start (generated by giuzu_evolve.py from identity_updates.json) -->'
+AUTO_END = '<!-- auto-evolution:end -->'
+LEGACY_UPDATE_PATTERN = re.compile(r'\n\n---\n\n## Auto-Evolution Update \((\d{4}-\d{2}-\d{2}[^)]*)\)\n\n')
+
+# Match entries like: ## 2026-01-27: Topic
+ENTRY_PATTERN = re.compile(r'##\s*(\d{4}-\d{2}-\d{2}):\s*(.+?)(?=\n##|\Z)', re.DOTALL)
 
 
 def get_file_hash(filepath):
@@ -32,33 +51,34 @@ def get_file_hash(filepath):
     return hashlib.md5(filepath.read_bytes()).hexdigest()
 
 
+def entry_from_match(match):
+    date, body = match.groups()
+    # Extract key learnings
+    learnings = re.findall(r'[-*]\s*\*\*(.+?)\*\*:\s*(.+)', body)
+    return {
+        'date': date,
+        'content': body.strip(),
+        'learnings': learnings
+    }
+
+
 def parse_journal_entries(content):
     """Extract structured entries from journal.md"""
-    entries = []
-    # Match entries like: ## 2026-01-27: Topic
-    pattern = r'##\s*(\d{4}-\d{2}-\d{2}):\s*(.+?)(?=\n##|\Z)'
-    matches = re.findall(pattern, content, re.DOTALL)
-    
-    for date, body in matches:
-        # Extract key learnings
-        learnings = re.findall(r'[-*]\s*\*\*(.+?)\*\*:\s*(.+)', body)
-        entries.append({
-            'date': date,
-            'content': body.strip(),
-            'learnings': learnings
-        })
-    
-    return entries
+    return [entry_from_match(m) for m in ENTRY_PATTERN.finditer(content)]
 
 
-def extract_evolution_signals(entries):
-    """Identify patterns and traits from journal entries"""
-    signals = {
+def empty_signals():
+    return {
         'new_skills': [],
         'preferences': [],
         'lessons_learned': [],
         'recurring_themes': {},
     }
+
+
+def extract_evolution_signals(entries):
+    """Identify patterns and traits from journal entries"""
+    signals = empty_signals()
     
     for entry in entries:
         for label, detail in entry.get('learnings', []):
@@ -78,63 +98,209 @@ def extract_evolution_signals(entries):
     return signals
 
 
+def merge_signals(base, new):
+    """Fold new signals into a copy of base, keeping only recent list items"""
+    merged = empty_signals()
+    for key in ('new_skills', 'preferences', 'lessons_learned'):
+        merged[key] = (base[key] + new[key])[-SIGNAL_HISTORY:]
+    merged['recurring_themes'] = dict(base['recurring_themes'])
+    for word, count in new['recurring_themes'].items():
+        merged['recurring_themes'][word] = merged['recurring_themes'].get(word, 0) + count
+    return merged
+
+
+def fresh_state():
+    return {'offset': 0, 'inode': None, 'probe_hash': hashlib.md5(b'').hexdigest(), 'entries': 0,
+            'totals': {'new_skills': 0, 'lessons_learned': 0}, 'signals': empty_signals()}
+
+
+def load_state():
+    try:
+        return json.loads(STATE_PATH.read_text())
+    except (OSError, ValueError):
+        return fresh_state()
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state))
+    tmp.replace(STATE_PATH)
+
+
+def checkpoint_probe(f, offset):
+    """Hash of the bytes just before offset, to tell appends from rewrites"""
+    start = max(0, offset - CHECKPOINT_PROBE)
+    f.seek(start)
+    return hashlib.md5(f.read(offset - start)).hexdigest()
+
+
+def read_new_text(state):
+    """
+    Return (state, bytes from the checkpoint to EOF). The state is reset when
+    the journal was replaced, truncated or edited before the checkpoint.
+    """
+    st = JOURNAL_PATH.stat()
+    with open(JOURNAL_PATH, 'rb') as f:
+        offset = state['offset']
+        if (offset > st.st_size or state['inode'] != st.st_ino
+                or checkpoint_probe(f, offset) != state['probe_hash']):
+            if offset:
+                print("   ♻️  Journal rewritten, re-parsing from the start")
+            state = fresh_state()
+            offset = 0
+        state['inode'] = st.st_ino
+        f.seek(offset)
+        return state, f.read()
+
+
+def advance_checkpoint(state, data, text, consumed_chars):
+    """
+    Move the checkpoint to the start of the line holding text[consumed_chars]
+    (text being data decoded) and refresh its probe hash. Newlines decode
+    one-for-one even with errors='replace', so the byte offset is exact, and a
+    line start never falls inside a partly written multi-byte character.
+    """
+    lines = text.count('\n', 0, consumed_chars)
+    state['offset'] += len(data) - len(data.split(b'\n', lines)[-1])
+    with open(JOURNAL_PATH, 'rb') as f:
+        state['probe_hash'] = checkpoint_probe(f, state['offset'])
+
+
+def load_identity_log():
+    """
+    Structured record of every identity update, keyed by date.
+    The first run migrates blocks previously appended to identity.md.
+    """
+    if IDENTITY_LOG_PATH.exists():
+        return json.loads(IDENTITY_LOG_PATH.read_text())
+
+    log = {'updates': {}}
+    if IDENTITY_PATH.exists():
+        parts = LEGACY_UPDATE_PATTERN.split(IDENTITY_PATH.read_text())
+        # split() yields [base, timestamp1, block1, timestamp2, block2, ...]
+        for timestamp, block in zip(parts[1::2], parts[2::2]):
+            log['updates'].setdefault(timestamp[:10], {'timestamp': timestamp, 'markdown': block.strip()})
+    return log
+
+
+def save_identity_log(log):
+    tmp = IDENTITY_LOG_PATH.with_suffix('.tmp')
+    tmp.write_text(json.dumps(log, indent=2, ensure_ascii=False))
+    tmp.replace(IDENTITY_LOG_PATH)
+
+
+def render_update(update):
+    """Markdown body for one auto-evolution update"""
+    if 'markdown' in update:
+        return update['markdown'] + "\n"
+
+    block = ""
+    if update['new_skills']:
+        block += "### New Skills Acquired\n"
+        for skill in update['new_skills']:
+            block += f"- {skill}\n"
+
+    if update['lessons_learned']:
+        block += "\n### Lessons Integrated\n"
+        for lesson in update['lessons_learned']:
+            block += f"- {lesson}\n"
+
+    if update['themes']:
+        block += "\n### Emerging Themes\n"
+        for theme, count in update['themes']:
+            block += f"- **{theme}** (mentioned {count}x)\n"
+    return block
+
+
+def identity_base():
+    """Hand-written part of identity.md, i.e. everything before the generated section"""
+    if not IDENTITY_PATH.exists():
+        return "# Giuzu Identity\n"
+    current = IDENTITY_PATH.read_text()
+    cut = current.find(AUTO_START)
+    legacy = LEGACY_UPDATE_PATTERN.search(current)
+    if legacy and (cut < 0 or legacy.start() < cut):
+        cut = legacy.start()
+    return current if cut < 0 else current[:cut]
+
+
+def render_identity(log):
+    """Regenerate identity.md: hand-written base + the most recent updates only"""
+    recent = sorted(log['updates'])[-MAX_RENDERED_UPDATES:]
+    blocks = "".join(
+        f"\n---\n\n## Auto-Evolution Update ({log['updates'][date].get('timestamp', date)})\n\n"
+        f"{render_update(log['updates'][date])}"
+        for date in recent
+    )
+    text = f"{identity_base().rstrip()}\n\n{AUTO_START}\n{blocks}{AUTO_END}\n"
+    tmp = IDENTITY_PATH.with_suffix('.tmp')
+    tmp.write_text(text)
+    tmp.replace(IDENTITY_PATH)
+
+
 def update_identity(signals):
-    """Append new insights to identity.md"""
+    """Record today's insights in the identity log and re-render identity.md"""
     if not signals['new_skills'] and not signals['lessons_learned']:
         return False
     
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
-    update_block = f"\n\n---\n\n## Auto-Evolution Update ({timestamp})\n\n"
-    
-    if signals['new_skills']:
-        update_block += "### New Skills Acquired\n"
-        for skill in signals['new_skills'][-5:]:  # Last 5 only
-            update_block += f"- {skill}\n"
-    
-    if signals['lessons_learned']:
-        update_block += "\n### Lessons Integrated\n"
-        for lesson in signals['lessons_learned'][-5:]:
-            update_block += f"- {lesson}\n"
-    
-    if signals['recurring_themes']:
-        top_themes = sorted(signals['recurring_themes'].items(), key=lambda x: -x[1])[:5]
-        if top_themes:
-            update_block += "\n### Emerging Themes\n"
-            for theme, count in top_themes:
-                update_block += f"- **{theme}** (mentioned {count}x)\n"
-    
-    # Append to identity.md
-    if IDENTITY_PATH.exists():
-        current = IDENTITY_PATH.read_text()
-        # Check if we already have this update (avoid duplicates)
-        if f"## Auto-Evolution Update ({timestamp[:10]}" not in current:
-            IDENTITY_PATH.write_text(current + update_block)
-            return True
-    else:
-        IDENTITY_PATH.write_text(f"# Giuzu Identity\n\n{update_block}")
-        return True
-    
-    return False
+    log = load_identity_log()
+    # One update per day; the log is keyed by date so this is a dict lookup
+    if timestamp[:10] in log['updates']:
+        return False
+
+    top_themes = sorted(signals['recurring_themes'].items(), key=lambda x: -x[1])[:5]
+    log['updates'][timestamp[:10]] = {
+        'timestamp': timestamp,
+        'new_skills': signals['new_skills'][-5:],  # Last 5 only
+        'lessons_learned': signals['lessons_learned'][-5:],
+        'themes': top_themes,
+    }
+    save_identity_log(log)
+    render_identity(log)
+    return True
 
 
 def sync_once():
-    """Perform a single sync from journal to identity"""
+    """
+    Perform a single sync from journal to identity.
+    Only text appended since the last sync is parsed: entries before the last
+    one are final and folded into the persisted signals; the last entry may
+    still be growing, so it is re-read each time and never committed.
+    """
     print("🧠 Giuzu Self-Evolution: Syncing...")
     
     if not JOURNAL_PATH.exists():
         print(f"   ⚠️  Journal not found: {JOURNAL_PATH}")
         return False
     
-    content = JOURNAL_PATH.read_text()
-    entries = parse_journal_entries(content)
-    print(f"   📖 Found {len(entries)} journal entries")
+    state, data = read_new_text(load_state())
+    text = data.decode('utf-8', errors='replace')
+    matches = list(ENTRY_PATTERN.finditer(text))
+
+    if matches:
+        complete = [entry_from_match(m) for m in matches[:-1]]
+        committed = extract_evolution_signals(complete)
+        state['signals'] = merge_signals(state['signals'], committed)
+        state['entries'] += len(complete)
+        for key in state['totals']:
+            state['totals'][key] += len(committed[key])
+        advance_checkpoint(state, data, text, matches[-1].start())
+    save_state(state)
+
+    pending = extract_evolution_signals([entry_from_match(m) for m in matches[-1:]])
+    signals = merge_signals(state['signals'], pending)
+    entry_count = state['entries'] + len(matches[-1:])
+    print(f"   📖 Found {entry_count} journal entries")
     
-    if not entries:
+    if not entry_count:
         print("   ℹ️  No structured entries to process")
         return False
     
-    signals = extract_evolution_signals(entries)
-    print(f"   🎯 Detected: {len(signals['new_skills'])} skills, {len(signals['lessons_learned'])} lessons")
+    skills = state['totals']['new_skills'] + len(pending['new_skills'])
+    lessons = state['totals']['lessons_learned'] + len(pending['lessons_learned'])
+    print(f"   🎯 Detected: {skills} skills, {lessons} lessons")
     
     if update_identity(signals):
         print("   ✅ Identity updated with new insights!")
@@ -144,38 +310,143 @@ def sync_once():
         return False
 
 
-def watch_mode():
+class InotifyWatcher:
+    """Kernel change notifications for files in one directory (Linux only, via libc)"""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, directory, names):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.names = set(names)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+
+    def wait(self, timeout=None):
+        """Block until a watched file changes (or timeout); return changed names"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if name in self.names:
+                changed.add(name)
+        return changed
+
+
+class PollingWatcher:
+    """Fallback watcher: cheap stat() checks, hashing only files whose mtime/size moved"""
+
+    def __init__(self, directory, names):
+        self.paths = {name: Path(directory) / name for name in names}
+        self.stats = {name: self._stat(path) for name, path in self.paths.items()}
+        self.hashes = {name: get_file_hash(path) for name, path in self.paths.items()}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = path.stat()
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _poll(self):
+        changed = set()
+        for name, path in self.paths.items():
+            stat = self._stat(path)
+            if stat == self.stats[name]:
+                continue
+            self.stats[name] = stat
+            digest = get_file_hash(path)
+            if digest != self.hashes[name]:
+                self.hashes[name] = digest
+                changed.add(name)
+        return changed
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._poll()
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            delay = WATCH_INTERVAL if deadline is None else min(WATCH_INTERVAL, max(0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+
+def watched_files(all_files=False):
+    """Journal by default; every training file except our own output with --all"""
+    if not all_files:
+        return [JOURNAL_PATH.name]
+    names = {p.name for p in GIUZU_DIR.iterdir() if p.is_file()}
+    names.add(JOURNAL_PATH.name)
+    names.discard(IDENTITY_PATH.name)
+    names.discard(IDENTITY_LOG_PATH.name)
+    return sorted(names)
+
+
+def make_watcher(names):
+    try:
+        return InotifyWatcher(GIUZU_DIR, names), 'inotify'
+    except (OSError, AttributeError):
+        return PollingWatcher(GIUZU_DIR, names), f'polling every {WATCH_INTERVAL}s'
+
+
+def watch_mode(all_files=False):
     """Continuously watch for journal changes"""
+    names = watched_files(all_files)
+    watcher, backend = make_watcher(names)
+
     print(f"🧠 Giuzu Self-Evolution Daemon")
-    print(f"   Watching: {JOURNAL_PATH}")
+    print(f"   Watching: {JOURNAL_PATH if not all_files else f'{len(names)} files in {GIUZU_DIR}'}")
     print(f"   Updating: {IDENTITY_PATH}")
-    print(f"   Interval: {WATCH_INTERVAL}s")
+    print(f"   Backend:  {backend} (debounce {DEBOUNCE_SECONDS}s)")
     print("   Press Ctrl+C to stop\n")
-    
-    last_hash = get_file_hash(JOURNAL_PATH)
-    
+
     try:
         while True:
-            time.sleep(WATCH_INTERVAL)
-            current_hash = get_file_hash(JOURNAL_PATH)
-            
-            if current_hash != last_hash:
-                print(f"\n📝 Journal changed at {datetime.now().strftime('%H:%M:%S')}")
-                sync_once()
-                last_hash = current_hash
-            else:
-                print(".", end="", flush=True)
+            changed = watcher.wait()
+            if not changed:
+                continue
+            # Let a burst of writes settle before syncing
+            while True:
+                more = watcher.wait(DEBOUNCE_SECONDS)
+                if not more:
+                    break
+                changed |= more
+
+            print(f"\n📝 Changed at {datetime.now().strftime('%H:%M:%S')}: {', '.join(sorted(changed))}")
+            sync_once()
     except KeyboardInterrupt:
         print("\n\n👋 Daemon stopped")
 
 
 def main():
     if '--watch' in sys.argv:
-        watch_mode()
+        watch_mode(all_files='--all' in sys.argv)
     elif '--once' in sys.argv or len(sys.argv) == 1:
         sync_once()
     else:
-        print("Usage: giuzu_evolve.py [--watch | --once]")
+        print("Usage: giuzu_evolve.py [--watch [--all] | --once]")
         sys.exit(1)
 
 
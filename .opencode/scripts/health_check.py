@@ -7,12 +7,22 @@ Usage:
   python3 .opencode/scripts/fast_test.py
   python3 .opencode/scripts/fast_test.py --agent maia
   python3 .opencode/scripts/fast_test.py --fix  # Suggest fixes for failed agents
+  python3 .opencode/scripts/health_check.py --probe  # Live-probe every agent's provider
+  python3 .opencode/scripts/health_check.py --probe --probe-url http://127.0.0.1:8080/v1  # Probe a stub server
+  python3 .opencode/scripts/health_check.py --probe --no-cache  # Ignore cached probe results
+  python3 .opencode/scripts/health_check.py --daemon [--interval 60]  # Continuous latency monitoring
 """
 
+import http.client
 import json
+import math
+import os
 import subprocess
 import sys
+import threading
 import time
+import urllib.error
+import urllib.request
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from datetime import datetime
@@ -26,6 +36,37 @@ BOLD = "\033[1m"
 RESET = "\033[0m"
 
 TIMEOUT_SECONDS = 20
+SLOW_THRESHOLD_SECONDS = 8    # Successful probes slower than this are reported as "slow"
+MAX_PROBE_WORKERS = 8         # Concurrent probes across all providers
+PROVIDER_CONCURRENCY = 2      # Concurrent probes per provider
+PROVIDER_MIN_INTERVAL = 0.25  # Seconds between probe starts on the same provider
+PROBE_CACHE_TTL = 300         # Seconds a provider/model probe result stays valid
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PROBE_CACHE_FILE = DATA_DIR / "health_probe_cache.json"
+
+# Daemon mode: rolling per-model latency windows and the dashboard snapshot
+DAEMON_INTERVAL = 60          # Seconds between probe rounds
+WINDOW_SECONDS = 300          # Width of one histogram window
+WINDOW_COUNT = 12             # Windows kept per model (12 x 5 min = last hour)
+P95_THRESHOLD_SECONDS = SLOW_THRESHOLD_SECONDS  # p95 above this proposes a fallback
+ERROR_RATE_THRESHOLD = 0.2    # Error rate above this proposes a fallback
+MIN_SAMPLES = 5               # Samples needed before proposing anything
+SNAPSHOT_FILE = Path(__file__).parent.parent.parent / "ecosystem" / "monitoring" / "latency.json"
+
+# OpenAI-compatible endpoints used when opencode.json doesn't set options.baseURL
+PROVIDER_ENDPOINTS = {
+    "google": "https://generativelanguage.googleapis.com/v1beta/openai",
+    "openrouter": "https://openrouter.ai/api/v1",
+    "opencode": "https://opencode.ai/zen/v1",
+}
+
+PROVIDER_KEY_ENV = {
+    "google": "GOOGLE_GENERATIVE_AI_API_KEY",
+    "openrouter": "OPENROUTER_API_KEY",
+    "opencode": "OPENCODE_API_KEY",
+    "zai-coding-plan": "ZAI_API_KEY",
+}
 
 # Fallback models for each provider type
 FALLBACKS = {
@@ -84,6 +125,385 @@ def test_agent_simple(agent_name: str, model: str) -> dict:
     return result
 
 
+class HttpTransport:
+    """
+    Sends a minimal OpenAI-compatible chat completion and returns the HTTP status.
+    Swap in any object with the same send() signature (e.g. for tests).
+    """
+
+    def send(self, base_url: str, api_key: str, model: str, timeout: float) -> int:
+        body = json.dumps({
+            "model": model,
+            "messages": [{"role": "user", "content": "ping"}],
+            "max_tokens": 1,
+        }).encode()
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        request = urllib.request.Request(f"{base_url.rstrip('/')}/chat/completions", data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+class ProviderLimiter:
+    """Caps in-flight probes per provider and spaces out their start times"""
+
+    def __init__(self, concurrency: int = PROVIDER_CONCURRENCY, min_interval: float = PROVIDER_MIN_INTERVAL):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def acquire(self, provider: str):
+        with self._lock:
+            slot = self._slots.setdefault(provider, threading.Semaphore(self.concurrency))
+        slot.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(provider, now))
+            self._next_start[provider] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, provider: str):
+        self._slots[provider].release()
+
+
+def resolve_endpoint(model: str, config: dict, base_url_override: str = None) -> tuple:
+    """Split provider/model-id and find the provider's base URL and API key"""
+    provider, _, model_id = model.partition("/")
+    provider_options = config.get("provider", {}).get(provider, {}).get("options", {})
+    base_url = base_url_override or provider_options.get("baseURL") or PROVIDER_ENDPOINTS.get(provider)
+    api_key = os.environ.get(PROVIDER_KEY_ENV.get(provider, ""), "")
+    return provider, model_id, base_url, api_key
+
+
+def probe_model(model: str, config: dict, transport, limiter: ProviderLimiter,
+                base_url_override: str = None) -> tuple:
+    """
+    Live test: send a tiny request to the model's provider and time it.
+    Returns (result, probed) where result holds status/message/response_time
+    and probed is False when no request could be sent (nothing worth caching).
+    """
+    result = {
+        "status": "unknown",
+        "message": "",
+        "response_time": 0
+    }
+
+    provider, model_id, base_url, api_key = resolve_endpoint(model, config, base_url_override)
+    if not base_url:
+        result["status"] = "risky"
+        result["message"] = f"No endpoint known for provider '{provider}'"
+        return result, False
+    if not api_key and not base_url_override:
+        result["status"] = "risky"
+        result["message"] = f"${PROVIDER_KEY_ENV.get(provider, provider.upper() + '_API_KEY')} not set, probe skipped"
+        return result, False
+
+    limiter.acquire(provider)
+    start = time.time()
+    try:
+        code = transport.send(base_url, api_key, model_id, TIMEOUT_SECONDS)
+        elapsed = time.time() - start
+    except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError) as e:
+        # Broken responses (IncompleteRead, BadStatusLine, RemoteDisconnected,
+        # undecodable bodies) fail this probe only, not the whole sweep
+        elapsed = time.time() - start
+        reason = getattr(e, "reason", e)
+        if isinstance(reason, TimeoutError) or "timed out" in str(reason):
+            result["status"] = "fail"
+            result["message"] = f"Timed out after {TIMEOUT_SECONDS}s"
+        elif isinstance(e, (http.client.HTTPException, ValueError)) and not isinstance(e, OSError):
+            result["status"] = "fail"
+            result["message"] = f"Bad response: {type(e).__name__}: {e}"
+        else:
+            result["status"] = "fail"
+            result["message"] = f"Connection error: {reason}"
+        result["response_time"] = elapsed
+        return result, True
+    finally:
+        limiter.release(provider)
+
+    result["response_time"] = elapsed
+    if elapsed > TIMEOUT_SECONDS:
+        result["status"] = "fail"
+        result["message"] = f"Timed out after {TIMEOUT_SECONDS}s"
+    elif 200 <= code < 300:
+        result["status"] = "slow" if elapsed > SLOW_THRESHOLD_SECONDS else "ok"
+        result["message"] = f"Responded in {elapsed:.2f}s"
+    elif code == 429 or code >= 500:
+        result["status"] = "risky"
+        result["message"] = f"HTTP {code} from {provider} after {elapsed:.2f}s"
+    elif code in (401, 403):
+        result["status"] = "fail"
+        result["message"] = f"HTTP {code}: credentials rejected by {provider}"
+    else:
+        result["status"] = "fail"
+        result["message"] = f"HTTP {code} from {provider}"
+    return result, True
+
+
+def load_probe_cache() -> dict:
+    try:
+        with open(PROBE_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_probe_cache(cache: dict):
+    now = time.time()
+    fresh = {k: v for k, v in cache.items() if now - v.get("checked_at", 0) < PROBE_CACHE_TTL}
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = PROBE_CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(fresh))
+    tmp.replace(PROBE_CACHE_FILE)
+
+
+def probe_agents(agents: dict, config: dict, transport=None, base_url_override: str = None,
+                 max_workers: int = MAX_PROBE_WORKERS, use_cache: bool = True) -> list:
+    """
+    Probe each distinct provider/model once, concurrently, and fan the result
+    out to every agent using it. Results younger than PROBE_CACHE_TTL are
+    reused from .opencode/data instead of probing. Keeps the config's agent order.
+    """
+    transport = transport or HttpTransport()
+    limiter = ProviderLimiter()
+    if not agents:
+        return []
+
+    models = {}
+    for name, agent_config in agents.items():
+        models.setdefault(agent_config.get("model", "unknown"), []).append(name)
+
+    cache = load_probe_cache()
+    now = time.time()
+    by_model = {}
+    to_probe = []
+    for model in models:
+        _, _, base_url, _ = resolve_endpoint(model, config, base_url_override)
+        key = f"{base_url}|{model}"
+        entry = cache.get(key)
+        if use_cache and entry and now - entry.get("checked_at", 0) < PROBE_CACHE_TTL:
+            age = int(now - entry["checked_at"])
+            by_model[model] = dict(entry["result"], message=f"{entry['result']['message']} (cached {age}s ago)")
+        else:
+            to_probe.append((model, key))
+
+    if to_probe:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [
+            executor.submit(probe_model, model, config, transport, limiter, base_url_override)
+            for model, _ in to_probe
+        ]
+
+        # Backstop for probes stuck past their socket timeout: allow one timeout
+        # window per wave of workers, plus one for queueing behind rate limits.
+        waves = math.ceil(len(to_probe) / max_workers)
+        deadline = time.monotonic() + TIMEOUT_SECONDS * (waves + 1)
+        for (model, key), future in zip(to_probe, futures):
+            try:
+                result, probed = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeout:
+                result = {
+                    "status": "fail",
+                    "message": f"Timed out after {TIMEOUT_SECONDS}s",
+                    "response_time": TIMEOUT_SECONDS,
+                }
+                probed = True
+            by_model[model] = result
+            if probed:
+                cache[key] = {"checked_at": time.time(), "result": result}
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        try:
+            save_probe_cache(cache)
+        except OSError as e:
+            print(f"{YELLOW}⚠️ Could not write probe cache: {e}{RESET}")
+
+    return [
+        dict(by_model[agent_config.get("model", "unknown")], agent=name, model=agent_config.get("model", "unknown"))
+        for name, agent_config in agents.items()
+    ]
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of millisecond latencies in fixed memory.
+    Each power of two is split into SUB_BUCKETS linear buckets, so recorded
+    values keep ~3% relative precision from 1ms up to MAX_MS.
+    """
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    MAX_MS = (1 << 17) - 1  # ~131s, well past TIMEOUT_SECONDS
+
+    def __init__(self):
+        self.counts = [0] * self._index(self.MAX_MS + 1)
+        self.total = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return (shift + 1) * cls.SUB_BUCKETS + (value >> shift) - cls.SUB_BUCKETS
+
+    @classmethod
+    def _value(cls, index: int) -> int:
+        """Midpoint of the values that land in bucket index"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        mantissa = index % cls.SUB_BUCKETS + cls.SUB_BUCKETS
+        return (mantissa << shift) + (1 << shift) // 2
+
+    def record(self, seconds: float):
+        ms = min(max(int(seconds * 1000), 0), self.MAX_MS)
+        self.counts[self._index(ms)] += 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.total += other.total
+
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds at the given percentile (0-100)"""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * pct / 100))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self._value(i) / 1000
+        return self.MAX_MS / 1000
+
+
+class RollingLatency:
+    """Ring of WINDOW_COUNT histogram windows for one model, plus error counts"""
+
+    def __init__(self):
+        self.windows = []  # [start_time, histogram, probes, errors]
+
+    def _current(self, now: float) -> list:
+        if not self.windows or now - self.windows[-1][0] >= WINDOW_SECONDS:
+            self.windows.append([now, LatencyHistogram(), 0, 0])
+            del self.windows[:-WINDOW_COUNT]
+        return self.windows[-1]
+
+    def record(self, result: dict, now: float = None):
+        window = self._current(now or time.time())
+        window[2] += 1
+        if result["status"] in ("ok", "slow"):
+            window[1].record(result["response_time"])
+        else:
+            window[3] += 1
+
+    def stats(self) -> dict:
+        merged = LatencyHistogram()
+        probes = errors = 0
+        for _, hist, window_probes, window_errors in self.windows:
+            merged.merge(hist)
+            probes += window_probes
+            errors += window_errors
+        return {
+            "samples": merged.total,
+            "probes": probes,
+            "error_rate": round(errors / probes, 3) if probes else 0.0,
+            "p50": round(merged.percentile(50), 3),
+            "p95": round(merged.percentile(95), 3),
+            "p99": round(merged.percentile(99), 3),
+        }
+
+
+def propose_swaps(stats: dict, models: dict) -> list:
+    """Fallback proposals for models whose p95 or error rate breaches thresholds"""
+    proposals = []
+    for model, s in stats.items():
+        if s["probes"] < MIN_SAMPLES:
+            continue
+        if s["p95"] > P95_THRESHOLD_SECONDS:
+            reason = f"p95 {s['p95']:.2f}s > {P95_THRESHOLD_SECONDS}s"
+        elif s["error_rate"] > ERROR_RATE_THRESHOLD:
+            reason = f"error rate {s['error_rate']:.0%} > {ERROR_RATE_THRESHOLD:.0%}"
+        else:
+            continue
+        fallback = find_fallback(model)
+        if fallback == model:
+            continue
+        proposals.append({"model": model, "fallback": fallback, "reason": reason, "agents": models[model]})
+    return proposals
+
+
+def write_snapshot(stats: dict, proposals: list):
+    snapshot = {
+        "updated": datetime.now().isoformat(timespec="seconds"),
+        "window_seconds": WINDOW_SECONDS * WINDOW_COUNT,
+        "models": stats,
+        "proposals": proposals,
+    }
+    SNAPSHOT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SNAPSHOT_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+    tmp.replace(SNAPSHOT_FILE)
+
+
+def daemon_mode(config: dict, interval: float = DAEMON_INTERVAL, base_url_override: str = None, transport=None):
+    """Probe every distinct model each interval and publish rolling percentiles"""
+    transport = transport or HttpTransport()
+    limiter = ProviderLimiter()
+    models = {}
+    for name, agent_config in config.get("agent", {}).items():
+        models.setdefault(agent_config.get("model", "unknown"), []).append(name)
+    tracked = {model: RollingLatency() for model in models}
+
+    print(f"{BOLD}📈 Latency daemon{RESET}: {len(models)} models every {interval:g}s")
+    print(f"   Snapshot: {SNAPSHOT_FILE}")
+    print("   Press Ctrl+C to stop\n")
+
+    announced = set()
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_PROBE_WORKERS) as executor:
+            while True:
+                started = time.monotonic()
+                futures = {
+                    model: executor.submit(probe_model, model, config, transport, limiter, base_url_override)
+                    for model in models
+                }
+                for model, future in futures.items():
+                    try:
+                        result, probed = future.result(timeout=TIMEOUT_SECONDS * 2)
+                    except FuturesTimeout:
+                        result, probed = {"status": "fail", "response_time": TIMEOUT_SECONDS}, True
+                    if probed:
+                        tracked[model].record(result)
+
+                stats = {model: rolling.stats() for model, rolling in tracked.items()}
+                proposals = propose_swaps(stats, models)
+                write_snapshot(stats, proposals)
+
+                print(f"{datetime.now().strftime('%H:%M:%S')} ", end="")
+                print("  ".join(f"{m.split('/')[-1]} p95={s['p95']:.2f}s" for m, s in stats.items() if s["samples"]))
+                for p in proposals:
+                    key = (p["model"], p["fallback"])
+                    if key not in announced:
+                        announced.add(key)
+                        print(f"  {YELLOW}🔁 Proposed swap:{RESET} {p['model']} → {p['fallback']} ({p['reason']}; agents: {', '.join(p['agents'])})")
+
+                time.sleep(max(0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("\n\n👋 Daemon stopped")
+
+
 def print_results(results: list):
     """Print formatted results"""
     print(f"\n{BOLD}🚀 FAST AGENT TEST RESULTS{RESET}")
@@ -116,7 +536,8 @@ def print_results(results: list):
             icon = f"{RED}❌{RESET}"
             fail_count += 1
         
-        print(f"  {icon} {BOLD}{agent:<16}{RESET} | {model}")
+        latency = f" ({r['response_time']:.2f}s)" if r.get("response_time", 0) >= 0.01 else ""
+        print(f"  {icon} {BOLD}{agent:<16}{RESET} | {model}{latency}")
         if msg:
             print(f"      └─ {msg}")
     
@@ -126,6 +547,14 @@ def print_results(results: list):
     return {"ok": ok_count, "slow": slow_count, "risky": risky_count, "fail": fail_count}
 
 
+def find_fallback(model: str) -> str:
+    """First FALLBACKS entry whose pattern matches the model"""
+    for pattern, fb in FALLBACKS.items():
+        if pattern in model.lower():
+            return fb
+    return "google/gemini-2.5-flash"
+
+
 def suggest_fixes(results: list):
     """Suggest fixes for problematic agents"""
     problems = [r for r in results if r["status"] in ["risky", "fail", "unknown"]]
@@ -141,15 +570,7 @@ def suggest_fixes(results: list):
         agent = r["agent"]
         model = r["model"]
         
-        # Find appropriate fallback
-        fallback = None
-        for pattern, fb in FALLBACKS.items():
-            if pattern in model.lower():
-                fallback = fb
-                break
-        
-        if not fallback:
-            fallback = "google/gemini-2.5-flash"
+        fallback = find_fallback(model)
         
         print(f"\n  {BOLD}{agent}{RESET}:")
         print(f"    Current:  {model}")
@@ -179,15 +600,7 @@ def apply_fallbacks(config: dict, results: list) -> dict:
         agent = r["agent"]
         model = r["model"]
         
-        # Find fallback
-        fallback = None
-        for pattern, fb in FALLBACKS.items():
-            if pattern in model.lower():
-                fallback = fb
-                break
-        
-        if not fallback:
-            fallback = "google/gemini-2.5-flash"
+        fallback = find_fallback(model)
         
         # Update config
         if agent in config.get("agent", {}):
@@ -203,6 +616,17 @@ def main():
     
     config = load_config()
     agents = config.get("agent", {})
+
+    base_url_override = None
+    if "--probe-url" in args and args.index("--probe-url") + 1 < len(args):
+        base_url_override = args[args.index("--probe-url") + 1]
+
+    if "--daemon" in args:
+        interval = DAEMON_INTERVAL
+        if "--interval" in args and args.index("--interval") + 1 < len(args):
+            interval = float(args[args.index("--interval") + 1])
+        daemon_mode(config, interval, base_url_override)
+        return
     
     # Run tests
     results = []
@@ -227,10 +651,16 @@ def main():
         else:
              print(f"{YELLOW}⚠️ Memory Persistence Empty (Will initialize on first run).{RESET}")
     
-    for agent_name, agent_config in agents.items():
-        model = agent_config.get("model", "unknown")
-        result = test_agent_simple(agent_name, model)
-        results.append(result)
+    if "--probe" in args:
+        distinct = len({a.get("model", "unknown") for a in agents.values()})
+        print(f"{BOLD}🔬 Probing {len(agents)} agents via {distinct} distinct models (max {MAX_PROBE_WORKERS} in flight)...{RESET}")
+        results = probe_agents(agents, config, base_url_override=base_url_override,
+                               use_cache="--no-cache" not in args)
+    else:
+        for agent_name, agent_config in agents.items():
+            model = agent_config.get("model", "unknown")
+            result = test_agent_simple(agent_name, model)
+            results.append(result)
     
     # Print results
     summary = print_results(results)
@@ -0,0 +1,172 @@
+import http.client
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import health_check
+from health_check import HttpTransport, ProviderLimiter, probe_agents, probe_model
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible stub: the model name in the request picks the reply"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, body, self.headers.get("Authorization")))
+        model = body["model"]
+        if model == "hangup":
+            # Close without a status line (RemoteDisconnected on the client)
+            self.close_connection = True
+            return
+        if model == "truncated":
+            # Promise more body than is sent (IncompleteRead on the client)
+            self.send_response(200)
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            self.wfile.write(b"{}")
+            self.close_connection = True
+            return
+        status = {"busy": 429, "denied": 401}.get(model, 200)
+        payload = json.dumps({"choices": []}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestProbeAgainstStubServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.requests = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/v1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        # Keep probe results out of the real .opencode/data cache
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        data_dir = Path(tmp.name)
+        for name, value in [("DATA_DIR", data_dir), ("PROBE_CACHE_FILE", data_dir / "probe.json")]:
+            patcher = mock.patch.object(health_check, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def probe(self, model_id):
+        return probe_model(f"openrouter/{model_id}", {}, HttpTransport(), ProviderLimiter(), self.base_url)
+
+    def test_transport_posts_chat_completion(self):
+        status = HttpTransport().send(self.base_url, "secret", "tiny", 5)
+        self.assertEqual(status, 200)
+        path, body, auth = self.server.requests[-1]
+        self.assertEqual(path, "/v1/chat/completions")
+        self.assertEqual(body["model"], "tiny")
+        self.assertEqual(body["max_tokens"], 1)
+        self.assertEqual(auth, "Bearer secret")
+
+    def test_transport_returns_http_error_status(self):
+        self.assertEqual(HttpTransport().send(self.base_url, "", "busy", 5), 429)
+
+    def test_probe_statuses(self):
+        expected = {"tiny": "ok", "busy": "risky", "denied": "fail"}
+        for model_id, status in expected.items():
+            result, probed = self.probe(model_id)
+            self.assertTrue(probed)
+            self.assertEqual(result["status"], status, model_id)
+
+    def test_broken_responses_fail_the_probe(self):
+        for model_id in ("hangup", "truncated"):
+            result, probed = self.probe(model_id)
+            self.assertTrue(probed)
+            self.assertEqual(result["status"], "fail", model_id)
+
+    def test_protocol_errors_do_not_abort_the_sweep(self):
+        class FlakyTransport:
+            def send(self, base_url, api_key, model, timeout):
+                if model == "incomplete":
+                    raise http.client.IncompleteRead(b"")
+                if model == "bad-status":
+                    raise http.client.BadStatusLine("garbage")
+                if model == "bad-json":
+                    raise json.JSONDecodeError("Expecting value", "", 0)
+                return 200
+
+        agents = {
+            "a": {"model": "openrouter/incomplete"},
+            "b": {"model": "openrouter/bad-status"},
+            "c": {"model": "openrouter/bad-json"},
+            "d": {"model": "openrouter/tiny"},
+        }
+        results = probe_agents(agents, {}, FlakyTransport(), self.base_url, use_cache=False)
+        self.assertEqual([r["agent"] for r in results], ["a", "b", "c", "d"])
+        self.assertEqual([r["status"] for r in results], ["fail", "fail", "fail", "ok"])
+
+
+class TestProviderLimiter(unittest.TestCase):
+
+    def test_caps_concurrency_and_spaces_starts(self):
+        limiter = ProviderLimiter(concurrency=2, min_interval=0.05)
+        lock = threading.Lock()
+        in_flight = {"now": 0, "max": 0}
+        starts = []
+
+        def probe():
+            limiter.acquire("openrouter")
+            try:
+                with lock:
+                    starts.append(time.monotonic())
+                    in_flight["now"] += 1
+                    in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                time.sleep(0.1)
+                with lock:
+                    in_flight["now"] -= 1
+            finally:
+                limiter.release("openrouter")
+
+        threads = [threading.Thread(target=probe) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(in_flight["max"], 2)
+        starts.sort()
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        self.assertGreaterEqual(min(gaps), 0.045)
+
+    def test_providers_are_limited_independently(self):
+        limiter = ProviderLimiter(concurrency=1, min_interval=0)
+        limiter.acquire("google")
+        acquired = threading.Event()
+
+        def other():
+            limiter.acquire("openrouter")
+            acquired.set()
+            limiter.release("openrouter")
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        limiter.release("google")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,76 +1,538 @@
+"""
+WhatsApp chat ingestion.
+
+Default run: stream the bundled export and dump G's clean text.
+
+Pipeline mode:
+  python3 .opencode/scripts/process_whatsapp.py --ingest <exports_dir> [--jobs 4] [--store-format jsonl]
+  python3 .opencode/scripts/process_whatsapp.py --sender G [--out clean.txt]
+
+Re-ingesting is incremental: a per-source checkpoint (last timestamp + content
+hashes of the messages at it) means a newer export of the same chat only
+appends its new tail; messages overlapping the previous export are recognized
+by content hash. Use --full to rebuild from scratch.
+
+Exports are auto-detected (bracketed "[date, time] Sender: msg" or dashed
+"date, time - Sender: msg", 12h/24h clocks, M/D/Y, D/M/Y or Y/M/D dates) and
+normalized into a message store under ingest/store: one Parquet file per
+export when pyarrow is installed (Arrow IPC on request), JSONL otherwise.
+"""
+
 import re
 import os
+import json
+import hashlib
+import argparse
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Optional columnar backend
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Export layouts across platforms/locales. Dates may use / . or -, times may
+# drop seconds and carry an am/pm suffix (iOS puts a narrow no-break space before it).
+_DATE = r'(\d{1,4}[./-]\d{1,2}[./-]\d{1,4})'
+_TIME = r'(\d{1,2}[:.]\d{2}(?:[:.]\d{2})?(?:\s?[AaPp]\.?\s?[Mm]\.?)?)'
+LAYOUTS = {
+    # [4/16/25, 7:17:05 PM] Sender: message
+    'bracketed': re.compile(r'^\[' + _DATE + r',?\s' + _TIME + r'\]\s([^:]+):\s(.*)$'),
+    # 16/04/2025, 19:17 - Sender: message
+    'dash': re.compile(r'^' + _DATE + r',?\s' + _TIME + r'\s[-–]\s([^:]+):\s(.*)$'),
+}
+TIME_PARTS = re.compile(r'(\d{1,2})[:.](\d{2})(?:[:.](\d{2}))?\s?([AaPp])?')
+DETECT_SAMPLE_LINES = 5000
+
+ChatFormat = namedtuple('ChatFormat', 'layout date_order clock')
+
+INGEST_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ingest')
+OUTPUT_PATH = os.path.join(INGEST_DIR, 'whatsapp_g_clean.txt')
+STORE_DIR = os.path.join(INGEST_DIR, 'store')
+CLEAN_CHECKPOINTS = os.path.join(INGEST_DIR, 'whatsapp_g_clean.checkpoints.json')
+STORE_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow', 'jsonl': '.jsonl'}
+STORE_BATCH_ROWS = 50_000
+
+
+def _clean_line(line):
+    # Remove LRM marks if present
+    return line.replace('\u200e', '')
+
+
+def detect_format(file_path, sample_lines=DETECT_SAMPLE_LINES):
+    """Guess layout, date order and clock from the first lines of an export"""
+    samples = {name: [] for name in LAYOUTS}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            if i >= sample_lines:
+                break
+            line = _clean_line(line)
+            for name, pattern in LAYOUTS.items():
+                match = pattern.match(line)
+                if match:
+                    samples[name].append(match.groups()[:2])
+
+    layout = max(samples, key=lambda name: len(samples[name]))
+    if not samples[layout]:
+        raise ValueError(f"Unrecognized WhatsApp export format: {file_path}")
+
+    clock = '12h' if any(TIME_PARTS.match(t).group(4) for _, t in samples[layout]) else '24h'
+    fields = [re.split(r'[./-]', d) for d, _ in samples[layout]]
+    if any(len(a) == 4 for a, _, _ in fields):
+        date_order = 'YMD'
+    elif any(int(a) > 12 for a, _, _ in fields):
+        date_order = 'DMY'
+    elif any(int(b) > 12 for _, b, _ in fields):
+        date_order = 'MDY'
+    else:
+        # Ambiguous sample: US exports pair M/D/Y with a 12h clock, most others are D/M/Y
+        date_order = 'MDY' if clock == '12h' else 'DMY'
+    return ChatFormat(layout, date_order, clock)
+
+
+def parse_timestamp(date, time, fmt):
+    """Export date/time strings -> datetime (None if they don't form a valid date)"""
+    a, b, c = (int(x) for x in re.split(r'[./-]', date))
+    if fmt.date_order == 'YMD':
+        year, month, day = a, b, c
+    elif fmt.date_order == 'DMY':
+        day, month, year = a, b, c
+    else:
+        month, day, year = a, b, c
+    if year < 100:
+        year += 2000
+
+    hour, minute, second, meridiem = TIME_PARTS.match(time).groups()
+    hour = int(hour)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem in 'Pp' else 0)
+    try:
+        return datetime(year, month, day, hour, int(minute), int(second or 0))
+    except ValueError:
+        return None
+
+
+def _build_message(header, continuation, fmt=None):
+    date, time, sender, content = header
+    lines = [content.strip()]
+    lines.extend(continuation)
+    message = {
+        'date': date,
+        'time': time,
+        'sender': sender.strip(),
+        'content': '\n'.join(lines),
+        'is_media': '<attached:' in content or 'omitted' in content
+    }
+    if fmt:
+        message['timestamp'] = parse_timestamp(date, time, fmt)
+    return message
+
+
+def iter_messages(file_path, fmt=None, since=None, on_skip=None):
+    """
+    Stream messages from an export one at a time.
+    Continuation lines are collected in a list and joined once per message,
+    so memory stays bounded by the longest single message. Messages stamped
+    before `since` are skipped without being assembled (on_skip() is called
+    for each).
+    """
+    fmt = fmt or detect_format(file_path)
+    pattern = LAYOUTS[fmt.layout]
+    header = None
+    continuation = []
 
-def parse_whatsapp(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    messages = []
-    # Regex for standard WhatsApp export format: [date, time] Sender: Message
-    # Example: [4/16/25, 7:17:05 PM] Rahib: Hello
-    pattern = re.compile(r'^\[(\d{1,2}/\d{1,2}/\d{2,4}),\s(\d{1,2}:\d{2}:\d{2}\s?[AP]M)\]\s([^:]+):\s(.*)$')
-
-    current_msg = None
-
-    for line in lines:
-        # Remove LRM marks if present
-        line = line.replace('\u200e', '')
-        match = pattern.match(line)
-        if match:
-            if current_msg:
-                messages.append(current_msg)
-            date, time, sender, content = match.groups()
-            current_msg = {
-                'date': date,
-                'time': time,
-                'sender': sender.strip(),
-                'content': content.strip(),
-                'is_media': '<attached:' in content or 'omitted' in content
-            }
+        for line in f:
+            line = _clean_line(line)
+            match = pattern.match(line)
+            if match:
+                if header:
+                    yield _build_message(header, continuation, fmt)
+                header = match.groups()
+                continuation = []
+                if since:
+                    ts = parse_timestamp(header[0], header[1], fmt)
+                    if ts and ts < since:
+                        header = None
+                        if on_skip:
+                            on_skip()
+            elif header:
+                # Continuation of previous message
+                continuation.append(line.strip())
+
+    if header:
+        yield _build_message(header, continuation, fmt)
+
+
+def parse_whatsapp(file_path):
+    return list(iter_messages(file_path))
+
+
+def message_hash(message):
+    """Content hash identifying a message across exports"""
+    ts = message.get('timestamp')
+    when = ts.isoformat() if isinstance(ts, datetime) else ts or f"{message['date']} {message['time']}"
+    key = f"{when}\x1f{message['sender']}\x1f{message['content']}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class TailFilter:
+    """
+    Drops messages already covered by a source checkpoint and tracks the
+    checkpoint for what passes through. A checkpoint is
+    {'last_timestamp': iso, 'last_hashes': [...]}: content hashes of every
+    message at the last timestamp (several can share a second, e.g. a burst of
+    photos), so the overlap with a newer export is matched message by message.
+    Messages whose timestamp could not be parsed cannot be placed relative to
+    it; they are matched by content hash against 'undated_hashes' instead.
+    """
+
+    def __init__(self, checkpoint=None):
+        checkpoint = checkpoint or {}
+        last = checkpoint.get('last_timestamp')
+        self.since = datetime.fromisoformat(last) if last else None
+        self.last_timestamp = self.since
+        self.last_hashes = list(checkpoint.get('last_hashes', []))
+        self.overlap = Counter(self.last_hashes)
+        self.undated_hashes = list(checkpoint.get('undated_hashes', []))
+        self.undated_seen = Counter(self.undated_hashes)
+        self.skipped = 0
+
+    def read(self, file_path, fmt=None):
+        """New messages of an export; self.skipped counts everything dropped"""
+        return self.filter(iter_messages(file_path, fmt, since=self.since, on_skip=self._skip))
+
+    def _skip(self):
+        self.skipped += 1
+
+    def filter(self, messages):
+        for m in messages:
+            ts = m.get('timestamp')
+            if ts is None:
+                digest = message_hash(m)
+                if self.undated_seen[digest]:
+                    self.undated_seen[digest] -= 1
+                    self.skipped += 1
+                    continue
+                self.undated_hashes.append(digest)
+                yield m
+                continue
+            if self.since and ts < self.since:
+                self.skipped += 1
+                continue
+            digest = message_hash(m)
+            if self.overlap[digest] and ts == self.since:
+                self.overlap[digest] -= 1
+                self.skipped += 1
+                continue
+            if self.last_timestamp is None or ts > self.last_timestamp:
+                self.last_timestamp = ts
+                self.last_hashes = []
+            if ts == self.last_timestamp:
+                self.last_hashes.append(digest)
+            yield m
+
+    def checkpoint(self):
+        return {
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp else None,
+            'last_hashes': self.last_hashes,
+            'undated_hashes': self.undated_hashes,
+        }
+
+
+def load_checkpoints(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoints(path, checkpoints):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoints, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def write_sender_text(messages, target_sender, output_path=OUTPUT_PATH, append=False):
+    """
+    Write the non-media text of target_sender's messages as they stream past.
+    Output only replaces output_path if the sender was found; with append=True
+    the text is added to the end of the existing file instead.
+    Returns (stats, senders seen).
+    """
+    stats = {'total': 0, 'target': 0, 'text': 0}
+    senders = set()
+    tmp_path = output_path if append else output_path + '.tmp'
+    mode = 'a' if append else 'w'
+    separate = append and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+
+    with open(tmp_path, mode, encoding='utf-8') as out:
+        for m in messages:
+            stats['total'] += 1
+            senders.add(m['sender'])
+            if m['sender'] != target_sender:
+                continue
+            stats['target'] += 1
+            if m['is_media']:
+                continue
+            if stats['text'] or separate:
+                out.write('\n')
+            out.write(m['content'])
+            stats['text'] += 1
+
+    if not append:
+        if target_sender in senders:
+            os.replace(tmp_path, output_path)
         else:
-            # Continuation of previous message
-            if current_msg:
-                current_msg['content'] += '\n' + line.strip()
-
-    if current_msg:
-        messages.append(current_msg)
-    
-    return messages
-
-def analyze_g_messages(messages, target_sender="G"):
-    # Filter for G
-    g_msgs = [m for m in messages if m['sender'] == target_sender]
-    
-    # Text dump
-    text_content = [m['content'] for m in g_msgs if not m['is_media']]
-    
-    # Print stats
-    print(f"Total Messages: {len(messages)}")
-    print(f"Target '{target_sender}' Messages: {len(g_msgs)}")
-    print(f"Clean Text Lines: {len(text_content)}")
-    
-    # Save to file
-    output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ingest', 'whatsapp_g_clean.txt')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(text_content))
-    
+            os.remove(tmp_path)
+    return stats, senders
+
+
+def print_stats(stats, target_sender, output_path=OUTPUT_PATH):
+    print(f"Total Messages: {stats['total']}")
+    print(f"Target '{target_sender}' Messages: {stats['target']}")
+    print(f"Clean Text Lines: {stats['text']}")
     print(f"Dumped clean text to {output_path}")
 
-    return text_content
 
-if __name__ == "__main__":
+def analyze_g_messages(messages, target_sender="G", output_path=OUTPUT_PATH):
+    stats, _ = write_sender_text(messages, target_sender, output_path)
+    print_stats(stats, target_sender, output_path)
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Message store
+# ---------------------------------------------------------------------------
+
+STORE_COLUMNS = ('source', 'timestamp', 'date', 'time', 'sender', 'content', 'is_media')
+
+
+def default_store_format():
+    return 'parquet' if HAS_PYARROW else 'jsonl'
+
+
+class StoreWriter:
+    """Streams message records into one store part, batching rows for columnar formats"""
+
+    def __init__(self, path, store_format):
+        if store_format != 'jsonl' and not HAS_PYARROW:
+            raise RuntimeError(f"{store_format} output needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.store_format = store_format
+        self.tmp_path = f"{path}.tmp"
+        self.rows = 0
+        if store_format == 'jsonl':
+            self._out = open(self.tmp_path, 'w', encoding='utf-8')
+        else:
+            self._schema = pa.schema([
+                ('source', pa.string()),
+                ('timestamp', pa.timestamp('s')),
+                ('date', pa.string()),
+                ('time', pa.string()),
+                ('sender', pa.string()),
+                ('content', pa.string()),
+                ('is_media', pa.bool_()),
+            ])
+            if store_format == 'parquet':
+                self._out = pq.ParquetWriter(self.tmp_path, self._schema)
+            else:
+                self._out = pa.ipc.new_file(self.tmp_path, self._schema)
+            self._batch = {name: [] for name in STORE_COLUMNS}
+
+    def write(self, record):
+        self.rows += 1
+        if self.store_format == 'jsonl':
+            ts = record['timestamp']
+            row = dict(record, timestamp=ts.isoformat() if ts else None)
+            self._out.write(json.dumps({k: row[k] for k in STORE_COLUMNS}, ensure_ascii=False) + '\n')
+            return
+        for name in STORE_COLUMNS:
+            self._batch[name].append(record[name])
+        if len(self._batch['source']) >= STORE_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch['source']:
+            return
+        table = pa.Table.from_pydict(self._batch, schema=self._schema)
+        self._out.write_table(table)
+        self._batch = {name: [] for name in STORE_COLUMNS}
+
+    def close(self):
+        """Publish the part; an empty part is discarded instead"""
+        if self.store_format != 'jsonl':
+            self._flush()
+        self._out.close()
+        if self.rows:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+
+
+def source_name(file_path, export_dir):
+    """Stable store key for an export: its path relative to the export dir"""
+    relative = Path(file_path).relative_to(export_dir).with_suffix('')
+    return '__'.join(relative.parts)
+
+
+def source_parts(store_dir, source):
+    """Existing store parts for a source, oldest first"""
+    pattern = re.compile(re.escape(source) + r'\.(\d{4})\.(?:parquet|arrow|jsonl)$')
+    return sorted(p for p in os.listdir(store_dir) if pattern.match(p))
+
+
+def _ingest_file(job):
+    """
+    Worker: parse one export and append its new tail to the store as a new
+    part (runs in a pool process). Returns the updated checkpoint.
+    """
+    file_path, export_dir, store_dir, store_format, checkpoint = job
+    source = source_name(file_path, export_dir)
+    try:
+        fmt = detect_format(file_path)
+    except ValueError as e:
+        return {'source': source, 'error': str(e)}
+
+    parts = source_parts(store_dir, source)
+    seq = int(parts[-1].split('.')[-2]) + 1 if parts else 0
+    part = os.path.join(store_dir, f"{source}.{seq:04d}{STORE_FORMATS[store_format]}")
+    tail = TailFilter(checkpoint)
+    writer = StoreWriter(part, store_format)
+    for message in tail.read(file_path, fmt):
+        message['source'] = source
+        writer.write(message)
+    writer.close()
+    return {'source': source, 'messages': writer.rows, 'skipped': tail.skipped, 'format': fmt._asdict(),
+            'part': part if writer.rows else None, 'checkpoint': tail.checkpoint()}
+
+
+def ingest_directory(export_dir, store_dir=STORE_DIR, jobs=None, store_format=None, full=False):
+    """
+    Normalize every *.txt export under export_dir into the store, one process
+    per file. Only messages newer than each source's checkpoint are written,
+    unless full=True, which drops existing parts and checkpoints first.
+    """
+    store_format = store_format or default_store_format()
+    os.makedirs(store_dir, exist_ok=True)
+    checkpoint_path = os.path.join(store_dir, 'checkpoints.json')
+    checkpoints = {} if full else load_checkpoints(checkpoint_path)
+
+    files = sorted(str(p) for p in Path(export_dir).rglob('*.txt'))
+    work = []
+    for path in files:
+        source = source_name(path, export_dir)
+        if full:
+            for name in source_parts(store_dir, source):
+                os.remove(os.path.join(store_dir, name))
+        work.append((path, export_dir, store_dir, store_format, checkpoints.get(source)))
+
+    if len(work) <= 1 or jobs == 1:
+        results = [_ingest_file(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_ingest_file, work))
+
+    for r in results:
+        if 'checkpoint' in r:
+            checkpoints[r['source']] = r['checkpoint']
+    save_checkpoints(checkpoint_path, checkpoints)
+    return results
+
+
+def query_sender(sender, store_dir=STORE_DIR):
+    """Yield every stored message from sender, in source then message order"""
+    for part in sorted(Path(store_dir).iterdir()):
+        if part.suffix == '.parquet':
+            if not HAS_PYARROW:
+                raise RuntimeError("Reading Parquet store parts needs pyarrow")
+            yield from pq.read_table(part, filters=[('sender', '==', sender)]).to_pylist()
+        elif part.suffix == '.arrow':
+            if not HAS_PYARROW:
+                raise RuntimeError("Reading Arrow store parts needs pyarrow")
+            with pa.memory_map(str(part)) as source:
+                table = pa.ipc.open_file(source).read_all()
+            yield from table.filter(pc.equal(table['sender'], sender)).to_pylist()
+        elif part.suffix == '.jsonl':
+            needle = f'"sender": {json.dumps(sender, ensure_ascii=False)}'
+            with open(part, encoding='utf-8') as f:
+                for line in f:
+                    # Substring check first; only candidate lines get decoded
+                    if needle in line:
+                        record = json.loads(line)
+                        if record['sender'] == sender:
+                            yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WhatsApp export ingestion")
+    parser.add_argument('--ingest', metavar='DIR', help="Normalize all *.txt exports under DIR into the store")
+    parser.add_argument('--sender', help="Write this sender's clean text from the store")
+    parser.add_argument('--store', default=STORE_DIR, help="Message store directory")
+    parser.add_argument('--store-format', choices=sorted(STORE_FORMATS), help="Default: parquet if pyarrow is installed, else jsonl")
+    parser.add_argument('--jobs', type=int, help="Worker processes for --ingest (default: CPU count)")
+    parser.add_argument('--out', default=OUTPUT_PATH, help="Output file for --sender")
+    parser.add_argument('--full', action='store_true', help="Ignore checkpoints and reprocess everything")
+    args = parser.parse_args()
+
+    if args.ingest:
+        results = ingest_directory(args.ingest, args.store, args.jobs, args.store_format, args.full)
+        for r in results:
+            if 'error' in r:
+                print(f"⚠️  {r['source']}: {r['error']}")
+            elif not r['messages']:
+                print(f"✔️  {r['source']}: up to date ({r['skipped']} already ingested)")
+            else:
+                fmt = r['format']
+                print(f"✅ {r['source']}: {r['messages']} new messages, {r['skipped']} skipped "
+                      f"({fmt['layout']}, {fmt['date_order']}, {fmt['clock']}) -> {r['part']}")
+    if args.sender:
+        stats, _ = write_sender_text(query_sender(args.sender, args.store), args.sender, args.out)
+        if stats['target']:
+            print_stats(stats, args.sender, args.out)
+        else:
+            print(f"No messages from '{args.sender}' in {args.store}")
+    if args.ingest or args.sender:
+        return
+
     chat_file = ".opencode/ingest/whatsapp/rahib_glord_mub_maia.txt"
     if os.path.exists(chat_file):
         print(f"Processing {chat_file}...")
-        msgs = parse_whatsapp(chat_file)
-        # Identify the user name for G. In the chat it appears as "G".
-        # We will scan senders just to be sure.
-        senders = set(m['sender'] for m in msgs)
-        print(f"Found senders: {senders}")
-        
-        if "G" in senders:
-            analyze_g_messages(msgs, "G")
+        source = Path(chat_file).stem
+        checkpoints = {} if args.full else load_checkpoints(CLEAN_CHECKPOINTS)
+        # Append to the existing dump only if it was produced from a checkpoint
+        checkpoint = checkpoints.get(source) if os.path.exists(OUTPUT_PATH) else None
+        tail = TailFilter(checkpoint)
+        fmt = detect_format(chat_file)
+
+        # Single streaming pass: filter for "G" while collecting every sender,
+        # so we can still report the senders if "G" turns out to be missing.
+        messages = tail.read(chat_file, fmt)
+        stats, senders = write_sender_text(messages, "G", append=checkpoint is not None)
+
+        if checkpoint and not stats['total']:
+            print(f"No new messages since {checkpoint['last_timestamp']} ({tail.skipped} already processed)")
+        elif "G" in senders or checkpoint:
+            print(f"Found senders: {senders}")
+            print_stats(stats, "G")
         else:
+            print(f"Found senders: {senders}")
             print("Could not find sender 'G'. Please check the sender name.")
+            return
+        checkpoints[source] = tail.checkpoint()
+        save_checkpoints(CLEAN_CHECKPOINTS, checkpoints)
     else:
         print(f"File not found: {chat_file}")
+
+
+if __name__ == "__main__":
+    main()
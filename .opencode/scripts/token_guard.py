@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+🛡️ MAIA Token Budget Guard
+In-process companion to token_monitor.py for per-call accounting.
+
+Usage counters live in a small mmap'd file shared by every process on the
+machine, so `check_budget()` is a couple of memory reads instead of a
+subprocess + JSON round trip. Recorded usage is also buffered in memory and
+flushed to token_usage.json in batches by a background thread, keeping
+`token_monitor.py --status` up to date.
+
+Usage (from Python):
+  from token_guard import check_budget, record_usage
+
+  if check_budget('coder', 12_000):
+      ...  # make the call
+      record_usage('coder', 11_482)
+
+Usage (CLI):
+  python3 token_guard.py --check <agent> <tokens>   # exit 0 if allowed, 1 if not
+  python3 token_guard.py --usage <agent>            # Show live counter
+"""
+
+import os
+import sys
+import mmap
+import struct
+import atexit
+import fcntl
+import threading
+import zlib
+from datetime import date
+
+from token_monitor import DATA_DIR, get_agent_tier, load_usage, save_usage, usage_lock
+
+# Configuration
+COUNTERS_FILE = DATA_DIR / 'token_counters.bin'
+FLUSH_INTERVAL = 5.0      # seconds between background flushes
+FLUSH_BATCH_SIZE = 64     # flush early once this many records are buffered
+
+# Shared counter layout: header + open-addressed table of (name, tokens) slots
+MAGIC = b'MTKG'
+VERSION = 1
+HEADER = struct.Struct('<4sIq')        # magic, version, day ordinal
+SLOT = struct.Struct('<48sq')          # agent name (utf-8, NUL padded), tokens
+SLOT_COUNT = 256
+FILE_SIZE = HEADER.size + SLOT.size * SLOT_COUNT
+
+
+class SharedCounters:
+    """Per-agent daily token totals in a mmap'd file, visible to all processes.
+
+    Reads are lock-free; writes take an exclusive flock on the counters file.
+    The table resets itself on the first write of a new day.
+    """
+
+    def __init__(self, path=COUNTERS_FILE):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            fresh = os.fstat(self._fd).st_size < FILE_SIZE
+            if fresh:
+                os.ftruncate(self._fd, FILE_SIZE)
+            self._mm = mmap.mmap(self._fd, FILE_SIZE)
+            magic, version, _ = HEADER.unpack_from(self._mm, 0)
+            if fresh or magic != MAGIC or version != VERSION:
+                self._reset(seed=True)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
+
+    def _today(self):
+        return date.today().toordinal()
+
+    def _reset(self, seed):
+        """Zero the table for today (caller holds the lock)"""
+        self._mm[:] = bytes(FILE_SIZE)
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._today())
+        if seed:
+            # Start from whatever has already been flushed for today
+            data = load_usage()
+            if data.get('date') == date.today().isoformat():
+                for agent, tokens in data.get('agents', {}).items():
+                    self._add_locked(agent, tokens)
+
+    def _find(self, key, insert=False):
+        """Return the slot offset for key, or None if absent and not inserting"""
+        index = zlib.crc32(key) % SLOT_COUNT
+        for _ in range(SLOT_COUNT):
+            offset = HEADER.size + index * SLOT.size
+            name, _ = SLOT.unpack_from(self._mm, offset)
+            if name == key:
+                return offset
+            if name == bytes(SLOT.size - 8):
+                if not insert:
+                    return None
+                # Count is zero already; publishing the name makes the slot visible
+                self._mm[offset:offset + 48] = key
+                return offset
+            index = (index + 1) % SLOT_COUNT
+        if insert:
+            raise RuntimeError(f"Token counter table full ({SLOT_COUNT} agents)")
+        return None
+
+    @staticmethod
+    def _key(agent):
+        return agent.encode('utf-8')[:48].ljust(48, b'\0')
+
+    def _add_locked(self, agent, tokens):
+        offset = self._find(self._key(agent), insert=True)
+        name, current = SLOT.unpack_from(self._mm, offset)
+        SLOT.pack_into(self._mm, offset, name, current + tokens)
+        return current + tokens
+
+    def add(self, agent, tokens):
+        """Atomically add tokens to an agent's counter, returning the new total"""
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            _, _, day = HEADER.unpack_from(self._mm, 0)
+            if day != self._today():
+                self._reset(seed=False)
+            return self._add_locked(agent, tokens)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def reset(self):
+        """Zero the table and re-seed it from token_usage.json (e.g. after --reset)"""
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            self._reset(seed=True)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def get(self, agent):
+        """Current total for agent today (lock-free read)"""
+        _, _, day = HEADER.unpack_from(self._mm, 0)
+        if day != self._today():
+            return 0
+        offset = self._find(self._key(agent))
+        if offset is None:
+            return 0
+        return SLOT.unpack_from(self._mm, offset)[1]
+
+
+class TokenGuard:
+    """Budget checks against shared counters with batched JSON persistence"""
+
+    def __init__(self, counters=None, flush_interval=FLUSH_INTERVAL, batch_size=FLUSH_BATCH_SIZE):
+        self.counters = counters or SharedCounters()
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._flush_loop, name='token-guard-flush', daemon=True)
+        self._thread.start()
+
+    def check_budget(self, agent, tokens=0):
+        """Return True if agent can spend `tokens` more without exceeding its daily limit"""
+        _, config = get_agent_tier(agent)
+        limit = config['daily_limit']
+        if limit == float('inf'):
+            return True
+        return self.counters.get(agent) + tokens <= limit
+
+    def usage(self, agent):
+        return self.counters.get(agent)
+
+    def record_usage(self, agent, tokens):
+        """Count tokens immediately and queue them for the next JSON flush"""
+        total = self.counters.add(agent, tokens)
+        with self._lock:
+            self._pending[agent] = self._pending.get(agent, 0) + tokens
+            self._pending_count += 1
+            if self._pending_count >= self.batch_size:
+                self._wake.set()
+        return total
+
+    def flush(self):
+        """Write buffered usage to token_usage.json"""
+        with self._lock:
+            pending, self._pending, self._pending_count = self._pending, {}, 0
+        if not pending:
+            return
+        with usage_lock():
+            data = load_usage()
+            today = date.today().isoformat()
+            if data['date'] != today:
+                data = {'date': today, 'agents': {}, 'total': 0}
+            for agent, tokens in pending.items():
+                data['agents'][agent] = data['agents'].get(agent, 0) + tokens
+                data['total'] += tokens
+            save_usage(data)
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"⚠️  token_guard flush failed: {e}", file=sys.stderr)
+
+
+_guard = None
+_guard_lock = threading.Lock()
+
+
+def get_guard():
+    """Process-wide TokenGuard, created on first use and flushed at exit"""
+    global _guard
+    if _guard is None:
+        with _guard_lock:
+            if _guard is None:
+                _guard = TokenGuard()
+                atexit.register(_guard.close)
+    return _guard
+
+
+def _reset_after_fork():
+    # The flush thread does not survive fork(); children start their own guard
+    global _guard
+    _guard = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def check_budget(agent, tokens=0):
+    return get_guard().check_budget(agent, tokens)
+
+
+def record_usage(agent, tokens):
+    return get_guard().record_usage(agent, tokens)
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == '--check':
+        agent, tokens = sys.argv[2], int(sys.argv[3])
+        allowed = SharedCounters().get(agent) + tokens <= get_agent_tier(agent)[1]['daily_limit']
+        print(f"{'✅ allowed' if allowed else '🚨 over budget'}: {agent} +{tokens:,}")
+        sys.exit(0 if allowed else 1)
+    elif len(sys.argv) >= 3 and sys.argv[1] == '--usage':
+        agent = sys.argv[2]
+        tier, config = get_agent_tier(agent)
+        print(f"{agent} ({tier}): {SharedCounters().get(agent):,} / {config['daily_limit']:,}")
+    else:
+        print("Usage: token_guard.py [--check <agent> <tokens> | --usage <agent>]")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
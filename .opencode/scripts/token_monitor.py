@@ -5,6 +5,7 @@ Tracks token usage per agent and warns when limits are approached
 
 Usage:
   python3 token_monitor.py --status          # Show current usage
+  python3 token_monitor.py --status --json   # Machine-readable usage (dashboard polling)
   python3 token_monitor.py --reset           # Reset counters (new billing cycle)
   python3 token_monitor.py --add <agent> <tokens>  # Log usage
 """
@@ -12,15 +13,22 @@ Usage:
 import os
 import sys
 import json
+import fcntl
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / 'data'
 USAGE_FILE = DATA_DIR / 'token_usage.json'
+USAGE_LOCK_FILE = DATA_DIR / 'token_usage.lock'
+CONFIG_FILE = Path(__file__).parent.parent / 'config' / 'token_budgets.json'
+INDEX_CACHE_FILE = DATA_DIR / 'token_tier_index.json'
+DEFAULT_TIER = 'standard'
 
-# Budget limits per agent tier (tokens per day)
-BUDGETS = {
+# Built-in budget limits per agent tier (tokens per day), used when
+# config/token_budgets.json is missing
+DEFAULT_BUDGETS = {
     'premium': {
         'daily_limit': 1_000_000,
         'warning_threshold': 0.8,
@@ -48,6 +56,78 @@ def ensure_data_dir():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _read_budget_config():
+    """Parse config/token_budgets.json into BUDGETS shape (null limit = unlimited)"""
+    with open(CONFIG_FILE) as f:
+        config = json.load(f)
+    budgets = {}
+    for tier, tier_config in config['tiers'].items():
+        limit = tier_config.get('daily_limit')
+        budgets[tier] = {
+            'daily_limit': float('inf') if limit is None else limit,
+            'warning_threshold': tier_config.get('warning_threshold', 1.0),
+            'agents': list(tier_config.get('agents', [])),
+        }
+    default_tier = config.get('default_tier', DEFAULT_TIER)
+    if default_tier not in budgets:
+        fallback = DEFAULT_TIER if DEFAULT_TIER in budgets else next(iter(budgets))
+        print(f"⚠️  {CONFIG_FILE.name}: default_tier '{default_tier}' is not a defined tier, "
+              f"using '{fallback}'", file=sys.stderr)
+        default_tier = fallback
+    return budgets, default_tier
+
+
+def _compile_index(budgets):
+    """Flatten tier agent lists into an agent -> tier dict"""
+    return {agent: tier for tier, config in budgets.items() for agent in config['agents']}
+
+
+def load_budgets():
+    """
+    Load tier budgets and the agent -> tier index.
+    The compiled result is cached in data/ keyed by the config file's mtime,
+    so repeated invocations skip re-parsing and re-indexing the config.
+    """
+    if not CONFIG_FILE.exists():
+        return DEFAULT_BUDGETS, _compile_index(DEFAULT_BUDGETS), DEFAULT_TIER
+
+    mtime = CONFIG_FILE.stat().st_mtime_ns
+    try:
+        with open(INDEX_CACHE_FILE) as f:
+            cached = json.load(f)
+        # An unknown default_tier means the index predates tier validation
+        if cached['config_mtime'] == mtime and cached['default_tier'] in cached['budgets']:
+            budgets = cached['budgets']
+            for config in budgets.values():
+                if config['daily_limit'] is None:
+                    config['daily_limit'] = float('inf')
+            return budgets, cached['agent_tiers'], cached['default_tier']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    budgets, default_tier = _read_budget_config()
+    agent_tiers = _compile_index(budgets)
+    try:
+        ensure_data_dir()
+        serializable = {
+            tier: dict(config, daily_limit=None if config['daily_limit'] == float('inf') else config['daily_limit'])
+            for tier, config in budgets.items()
+        }
+        with open(INDEX_CACHE_FILE, 'w') as f:
+            json.dump({
+                'config_mtime': mtime,
+                'default_tier': default_tier,
+                'budgets': serializable,
+                'agent_tiers': agent_tiers,
+            }, f)
+    except OSError:
+        pass
+    return budgets, agent_tiers, default_tier
+
+
+BUDGETS, AGENT_TIERS, FALLBACK_TIER = load_budgets()
+
+
 def load_usage():
     ensure_data_dir()
     if USAGE_FILE.exists():
@@ -66,29 +146,46 @@ def save_usage(data):
         json.dump(data, f, indent=2)
 
 
+@contextmanager
+def usage_lock():
+    """Exclusive lock held around every read-modify-write of token_usage.json"""
+    ensure_data_dir()
+    with open(USAGE_LOCK_FILE, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
 def get_agent_tier(agent):
-    for tier, config in BUDGETS.items():
-        if agent in config['agents']:
-            return tier, config
-    return 'standard', BUDGETS['standard']
+    tier = AGENT_TIERS.get(agent, FALLBACK_TIER)
+    return tier, BUDGETS[tier]
 
 
 def add_usage(agent, tokens):
-    data = load_usage()
-    
-    # Reset if new day
-    today = datetime.now().strftime('%Y-%m-%d')
-    if data['date'] != today:
-        data = {'date': today, 'agents': {}, 'total': 0}
-    
-    # Add usage
-    if agent not in data['agents']:
-        data['agents'][agent] = 0
-    data['agents'][agent] += tokens
-    data['total'] += tokens
-    
-    save_usage(data)
-    
+    # Imported here: token_guard imports this module
+    from token_guard import SharedCounters
+
+    counters = SharedCounters()
+    try:
+        with usage_lock():
+            data = load_usage()
+
+            # Reset if new day
+            today = datetime.now().strftime('%Y-%m-%d')
+            if data['date'] != today:
+                data = {'date': today, 'agents': {}, 'total': 0}
+
+            # Add usage
+            if agent not in data['agents']:
+                data['agents'][agent] = 0
+            data['agents'][agent] += tokens
+            data['total'] += tokens
+
+            save_usage(data)
+            # Keep the live counters that token_guard checks in step
+            counters.add(agent, tokens)
+    finally:
+        counters.close()
+
     # Check warnings
     tier, config = get_agent_tier(agent)
     agent_usage = data['agents'][agent]
@@ -106,56 +203,90 @@ def add_usage(agent, tokens):
     return True
 
 
-def show_status():
+def tier_totals(data):
+    """Sum usage per tier in one pass over the agents that have usage"""
+    totals = {tier: 0 for tier in BUDGETS}
+    for agent, usage in data['agents'].items():
+        tier = AGENT_TIERS.get(agent)
+        if tier is not None:
+            totals[tier] += usage
+    return totals
+
+
+def get_status():
+    """Current usage as a JSON-serializable dict"""
     data = load_usage()
-    
-    print("💰 MAIA Token Budget Monitor")
-    print("━" * 50)
-    print(f"📅 Date: {data['date']}")
-    print(f"📊 Total tokens today: {data['total']:,}")
-    print()
-    
+    totals = tier_totals(data)
+    tiers = {}
     for tier, config in BUDGETS.items():
-        tier_total = sum(data['agents'].get(a, 0) for a in config['agents'])
         limit = config['daily_limit']
-        
-        if limit == float('inf'):
-            limit_str = "∞"
-            pct = 0
+        pct = 0.0 if limit == float('inf') else totals[tier] / limit * 100
+        if pct < config['warning_threshold'] * 100:
+            state = 'ok'
+        elif pct < 100:
+            state = 'warning'
         else:
-            limit_str = f"{limit:,}"
-            pct = tier_total / limit * 100
-        
-        status = "🟢" if pct < config['warning_threshold'] * 100 else "🟡" if pct < 100 else "🔴"
-        
-        print(f"{status} {tier.upper()}: {tier_total:,} / {limit_str} ({pct:.1f}%)")
-        for agent in config['agents']:
-            usage = data['agents'].get(agent, 0)
-            if usage > 0:
-                print(f"   └─ {agent}: {usage:,}")
-    
+            state = 'exceeded'
+        tiers[tier] = {
+            'used': totals[tier],
+            'limit': None if limit == float('inf') else limit,
+            'pct': round(pct, 1),
+            'state': state,
+            'agents': {a: data['agents'][a] for a in config['agents'] if data['agents'].get(a, 0) > 0},
+        }
+    return {'date': data['date'], 'total': data['total'], 'tiers': tiers}
+
+
+def show_status(as_json=False):
+    status = get_status()
+
+    if as_json:
+        print(json.dumps(status, separators=(',', ':')))
+        return
+
+    print("💰 MAIA Token Budget Monitor")
+    print("━" * 50)
+    print(f"📅 Date: {status['date']}")
+    print(f"📊 Total tokens today: {status['total']:,}")
+    print()
+
+    icons = {'ok': "🟢", 'warning': "🟡", 'exceeded': "🔴"}
+    for tier, info in status['tiers'].items():
+        limit_str = "∞" if info['limit'] is None else f"{info['limit']:,}"
+        print(f"{icons[info['state']]} {tier.upper()}: {info['used']:,} / {limit_str} ({info['pct']:.1f}%)")
+        for agent, usage in info['agents'].items():
+            print(f"   └─ {agent}: {usage:,}")
+
     print()
 
 
 def reset_usage():
+    from token_guard import SharedCounters
+
     data = {
         'date': datetime.now().strftime('%Y-%m-%d'),
         'agents': {},
         'total': 0
     }
-    save_usage(data)
+    counters = SharedCounters()
+    try:
+        with usage_lock():
+            save_usage(data)
+            counters.reset()
+    finally:
+        counters.close()
     print("✅ Token counters reset for new billing cycle")
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: token_monitor.py [--status | --reset | --add <agent> <tokens>]")
+        print("Usage: token_monitor.py [--status [--json] | --reset | --add <agent> <tokens>]")
         sys.exit(1)
     
     cmd = sys.argv[1]
     
     if cmd == '--status':
-        show_status()
+        show_status(as_json='--json' in sys.argv[2:])
     elif cmd == '--reset':
         reset_usage()
     elif cmd == '--add' and len(sys.argv) >= 4:
@@ -2,19 +2,30 @@
 """
 MAIA OpenCode Config Validator
 Validates opencode.json against the JSON schema
+
+Runs from hooks on every commit, so the expensive parts are cached in
+.opencode/data/config_validation_cache.json:
+  - the schema is checked against its metaschema once per schema hash
+  - if opencode.json and the schema hash the same as the last successful run,
+    validation is skipped entirely (--no-cache forces a full run)
+All schema errors are reported, not just the first.
 """
 
 import json
 import sys
+import hashlib
 from pathlib import Path
 
 # Try to import jsonschema, fallback to basic validation if not available
 try:
-    from jsonschema import validate, ValidationError
+    from jsonschema import SchemaError
+    from jsonschema.validators import validator_for
     HAS_JSONSCHEMA = True
 except ImportError:
     HAS_JSONSCHEMA = False
 
+CACHE_VERSION = 1
+
 def get_project_root():
     """Find the project root (where opencode.json lives)"""
     current = Path(__file__).resolve()
@@ -23,6 +34,40 @@ def get_project_root():
             return parent
     return None
 
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return cache if cache.get('version') == CACHE_VERSION else {}
+
+def save_cache(cache_path, cache):
+    cache['version'] = CACHE_VERSION
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(cache, indent=2))
+        tmp.replace(cache_path)
+    except OSError:
+        pass  # Caching is best-effort; never fail validation over it
+
+def compile_validator(schema, schema_hash, cache):
+    """Validator for schema; the metaschema check only runs when the schema changed"""
+    cls = validator_for(schema)
+    if cache.get('checked_schema') != schema_hash:
+        cls.check_schema(schema)
+        cache['checked_schema'] = schema_hash
+    return cls(schema)
+
+def schema_errors(validator, config):
+    """Every validation error as (message, path), sorted by path (array indices numerically)"""
+    errors = [(e.message, list(e.absolute_path)) for e in validator.iter_errors(config)]
+    return sorted(errors, key=lambda err: [(isinstance(p, int), p) for p in err[1]])
+
 def basic_validate(config):
     """Basic validation when jsonschema is not available"""
     errors = []
@@ -50,6 +95,7 @@ def basic_validate(config):
     return errors
 
 def main():
+    use_cache = '--no-cache' not in sys.argv
     root = get_project_root()
     if not root:
         print("❌ Could not find project root (opencode.json)")
@@ -57,26 +103,45 @@ def main():
     
     config_path = root / 'opencode.json'
     schema_path = root / '.opencode' / 'schema' / 'opencode.schema.json'
+    cache_path = root / '.opencode' / 'data' / 'config_validation_cache.json'
     
     # Load config
+    config_bytes = config_path.read_bytes()
     try:
-        with open(config_path) as f:
-            config = json.load(f)
+        config = json.loads(config_bytes)
     except json.JSONDecodeError as e:
         print(f"❌ Invalid JSON in opencode.json: {e}")
         sys.exit(1)
     
+    mode = 'schema' if HAS_JSONSCHEMA and schema_path.exists() else 'basic'
+    schema_bytes = schema_path.read_bytes() if mode == 'schema' else b''
+    run_key = {'config': content_hash(config_bytes), 'schema': content_hash(schema_bytes), 'mode': mode}
+    cache = load_cache(cache_path)
+    agent_count = len(config.get('agent', {}))
+    suffix = '' if mode == 'schema' else ' [basic check]'
+    
+    # Unchanged since the last successful run
+    if use_cache and cache.get('last_success') == run_key:
+        print(f"✅ opencode.json is valid ({agent_count} agents){suffix} [cached]")
+        sys.exit(0)
+    cache.pop('last_success', None)
+    
     # Validate
-    if HAS_JSONSCHEMA and schema_path.exists():
+    if mode == 'schema':
         try:
-            with open(schema_path) as f:
-                schema = json.load(f)
-            validate(instance=config, schema=schema)
-            print(f"✅ opencode.json is valid ({len(config.get('agent', {}))} agents)")
-            sys.exit(0)
-        except ValidationError as e:
-            print(f"❌ Schema validation failed: {e.message}")
-            print(f"   Path: {list(e.absolute_path)}")
+            schema = json.loads(schema_bytes)
+            validator = compile_validator(schema, run_key['schema'], cache)
+        except (json.JSONDecodeError, SchemaError) as e:
+            print(f"❌ Invalid schema {schema_path.name}: {getattr(e, 'message', e)}")
+            save_cache(cache_path, cache)
+            sys.exit(1)
+        errors = schema_errors(validator, config)
+        if errors:
+            print(f"❌ Schema validation failed ({len(errors)} errors):")
+            for message, path in errors:
+                print(f"   - {message}")
+                print(f"     Path: {path}")
+            save_cache(cache_path, cache)
             sys.exit(1)
     else:
         # Fallback to basic validation
@@ -85,11 +150,13 @@ def main():
             print("❌ Config validation failed:")
             for err in errors:
                 print(f"   - {err}")
+            save_cache(cache_path, cache)
             sys.exit(1)
-        else:
-            agent_count = len(config.get('agent', {}))
-            print(f"✅ opencode.json is valid ({agent_count} agents) [basic check]")
-            sys.exit(0)
+    
+    cache['last_success'] = run_key
+    save_cache(cache_path, cache)
+    print(f"✅ opencode.json is valid ({agent_count} agents){suffix}")
+    sys.exit(0)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+"""
+Benchmark and profile the OOXML validators on synthesized documents.
+
+Builds .docx/.pptx/.xlsx packages of a configurable size (an original file
+plus an edited, unpacked copy), then runs every validate_* check on its own
+and the full validate(), each in a fresh process so one check cannot warm
+the caches of another. Reports wall time, peak RSS and the number of XML
+parses per check.
+
+Usage:
+    python benchmark.py [--formats docx pptx xlsx] [--paragraphs N]
+                        [--tracked-changes N] [--slides N] [--media N]
+                        [--sheets N] [--rows N] [--repeat N]
+                        [--profile DIR] [--save FILE] [--compare FILE]
+
+Example:
+    python benchmark.py --formats docx --paragraphs 5000 --save before.json
+    ...  # change the validators
+    python benchmark.py --formats docx --paragraphs 5000 --compare before.json
+"""
+
+import argparse
+import contextlib
+import cProfile
+import inspect
+import io
+import json
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
+from validation import original as original_module
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+S_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+PIC_NS = "http://schemas.openxmlformats.org/drawingml/2006/picture"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+CT_PREFIX = "application/vnd.openxmlformats-officedocument."
+XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Author whose tracked changes RedliningValidator checks
+AUTHOR = "Claude"
+DATE = "2025-01-01T00:00:00Z"
+EMU = 914400  # One inch in English Metric Units
+
+# Slowdowns below this many seconds are treated as noise by --compare
+NOISE_FLOOR = 0.05
+
+
+def _png():
+    """A 1x1 white PNG image."""
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(b"\x00\xff\xff\xff"))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _content_types(overrides):
+    """[Content_Types].xml declaring the given {part name: content type}."""
+    entries = [
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>',
+        '<Default Extension="xml" ContentType="application/xml"/>',
+        '<Default Extension="png" ContentType="image/png"/>',
+    ]
+    entries += [
+        f'<Override PartName="/{name}" ContentType="{CT_PREFIX}{content_type}"/>'
+        for name, content_type in overrides.items()
+    ]
+    return f'{XML_DECL}<Types xmlns="{CT_NS}">{"".join(entries)}</Types>'
+
+
+def _rels(targets):
+    """A .rels part for [(rId, relationship type, target)]."""
+    entries = "".join(
+        f'<Relationship Id="{rid}" Type="{REL_TYPE}{kind}" Target="{target}"/>'
+        for rid, kind, target in targets
+    )
+    return f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">{entries}</Relationships>'
+
+
+def build_docx(paragraphs=1000, tracked_changes=100, media=10):
+    """Return (original parts, edited parts) of a Word document.
+
+    The edited document.xml adds tracked insertions and deletions by AUTHOR
+    to the first `tracked_changes` paragraphs, so RedliningValidator has work
+    to do and still passes. Images are spread evenly over the paragraphs.
+    """
+    every = max(1, paragraphs // media) if media else 0
+    rels = []
+    original_body = []
+    edited_body = []
+    image = 0
+    change_id = 0
+    for i in range(paragraphs):
+        text = f"Paragraph {i} of the benchmark document, with some text to check."
+        bookmark = (
+            f'<w:bookmarkStart w:id="{i}" w:name="p{i}"/><w:bookmarkEnd w:id="{i}"/>'
+        )
+        run = f"<w:r><w:t>{text}</w:t></w:r>"
+        edited = run
+        if i < tracked_changes:
+            change_id += 1
+            if i % 2:
+                edited = (
+                    f'<w:del w:id="{change_id}" w:author="{AUTHOR}" w:date="{DATE}">'
+                    f"<w:r><w:delText>{text}</w:delText></w:r></w:del>"
+                )
+            else:
+                edited = (
+                    f'{run}<w:ins w:id="{change_id}" w:author="{AUTHOR}" w:date="{DATE}">'
+                    f'<w:r><w:t xml:space="preserve"> Inserted text.</w:t></w:r></w:ins>'
+                )
+        original_body.append(f"<w:p>{bookmark}{run}</w:p>")
+        edited_body.append(f"<w:p>{bookmark}{edited}</w:p>")
+
+        if every and i % every == 0 and image < media:
+            image += 1
+            rid = f"rId{image + 1}"
+            rels.append((rid, "image", f"media/image{image}.png"))
+            drawing = (
+                f'<w:p><w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+                f'<wp:extent cx="{EMU}" cy="{EMU}"/>'
+                f'<wp:docPr id="{image}" name="Picture {image}"/>'
+                f'<a:graphic><a:graphicData uri="{PIC_NS}"><pic:pic>'
+                f'<pic:nvPicPr><pic:cNvPr id="{image}" name="image{image}.png"/><pic:cNvPicPr/></pic:nvPicPr>'
+                f'<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+                f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{EMU}" cy="{EMU}"/></a:xfrm>'
+                f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr>'
+                f"</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>"
+            )
+            original_body.append(drawing)
+            edited_body.append(drawing)
+
+    def document(body):
+        return (
+            f'{XML_DECL}<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}" '
+            f'xmlns:wp="{WP_NS}" xmlns:a="{A_NS}" xmlns:pic="{PIC_NS}">'
+            f'<w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+        )
+
+    parts = {
+        "[Content_Types].xml": _content_types(
+            {
+                "word/document.xml": "wordprocessingml.document.main+xml",
+                "word/settings.xml": "wordprocessingml.settings+xml",
+            }
+        ),
+        "_rels/.rels": _rels([("rId1", "officeDocument", "word/document.xml")]),
+        "word/_rels/document.xml.rels": _rels(
+            [("rId1", "settings", "settings.xml")] + rels
+        ),
+        "word/settings.xml": f'{XML_DECL}<w:settings xmlns:w="{W_NS}"/>',
+        "word/document.xml": document(original_body),
+    }
+    for n in range(1, image + 1):
+        parts[f"word/media/image{n}.png"] = _png()
+    return parts, dict(parts, **{"word/document.xml": document(edited_body)})
+
+
+def _theme():
+    colors = "".join(
+        f'<a:{name}><a:srgbClr val="{value}"/></a:{name}>'
+        for name, value in [
+            ("dk1", "000000"),
+            ("lt1", "FFFFFF"),
+            ("dk2", "44546A"),
+            ("lt2", "E7E6E6"),
+            ("accent1", "4472C4"),
+            ("accent2", "ED7D31"),
+            ("accent3", "A5A5A5"),
+            ("accent4", "FFC000"),
+            ("accent5", "5B9BD5"),
+            ("accent6", "70AD47"),
+            ("hlink", "0563C1"),
+            ("folHlink", "954F72"),
+        ]
+    )
+    font = '<a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/>'
+    fill = '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    return (
+        f'{XML_DECL}<a:theme xmlns:a="{A_NS}" name="Benchmark"><a:themeElements>'
+        f'<a:clrScheme name="Benchmark">{colors}</a:clrScheme>'
+        f'<a:fontScheme name="Benchmark"><a:majorFont>{font}</a:majorFont>'
+        f"<a:minorFont>{font}</a:minorFont></a:fontScheme>"
+        f'<a:fmtScheme name="Benchmark"><a:fillStyleLst>{fill * 3}</a:fillStyleLst>'
+        f"<a:lnStyleLst>{f'<a:ln>{fill}</a:ln>' * 3}</a:lnStyleLst>"
+        f"<a:effectStyleLst>{'<a:effectStyle><a:effectLst/></a:effectStyle>' * 3}</a:effectStyleLst>"
+        f"<a:bgFillStyleLst>{fill * 3}</a:bgFillStyleLst></a:fmtScheme>"
+        f"</a:themeElements></a:theme>"
+    )
+
+
+def build_pptx(slides=50, changes=10, media=10):
+    """Return (original parts, edited parts) of a presentation.
+
+    Images are spread round-robin over the slides; the edited copy rewrites
+    the title text of the first `changes` slides.
+    """
+    ns = f'xmlns:a="{A_NS}" xmlns:r="{R_NS}" xmlns:p="{P_NS}"'
+    group = (
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        "<p:grpSpPr/>"
+    )
+
+    def slide(i, images, title):
+        shapes = [
+            f'<p:sp><p:nvSpPr><p:cNvPr id="2" name="Title 1"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+            f'<p:spPr/><p:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r><a:rPr lang="en-US"/>'
+            f"<a:t>{title}</a:t></a:r></a:p></p:txBody></p:sp>"
+        ]
+        for n, rid in enumerate(images, start=3):
+            shapes.append(
+                f'<p:pic><p:nvPicPr><p:cNvPr id="{n}" name="Picture {n}"/><p:cNvPicPr/><p:nvPr/></p:nvPicPr>'
+                f'<p:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+                f'<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{EMU}" cy="{EMU}"/></a:xfrm>'
+                f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>'
+            )
+        return (
+            f'{XML_DECL}<p:sld {ns}><p:cSld><p:spTree>{group}{"".join(shapes)}</p:spTree></p:cSld>'
+            f"<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+        )
+
+    overrides = {
+        "ppt/presentation.xml": "presentationml.presentation.main+xml",
+        "ppt/slideMasters/slideMaster1.xml": "presentationml.slideMaster+xml",
+        "ppt/slideLayouts/slideLayout1.xml": "presentationml.slideLayout+xml",
+        "ppt/theme/theme1.xml": "theme+xml",
+    }
+    presentation_rels = [
+        ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"),
+        ("rId2", "theme", "theme/theme1.xml"),
+    ]
+    slide_ids = []
+    original, edited = {}, {}
+    slide_images = [[] for _ in range(slides)]
+    for n in range(1, media + 1 if slides else 1):
+        slide_images[(n - 1) % slides].append(n)
+
+    for i in range(1, slides + 1):
+        name = f"ppt/slides/slide{i}.xml"
+        overrides[name] = "presentationml.slide+xml"
+        rid = f"rId{i + 2}"
+        presentation_rels.append((rid, "slide", f"slides/slide{i}.xml"))
+        slide_ids.append(f'<p:sldId id="{255 + i}" r:id="{rid}"/>')
+
+        images = slide_images[i - 1]
+        image_rids = [f"rId{k + 2}" for k in range(len(images))]
+        original[f"ppt/slides/_rels/slide{i}.xml.rels"] = _rels(
+            [("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")]
+            + [
+                (rid, "image", f"../media/image{n}.png")
+                for rid, n in zip(image_rids, images)
+            ]
+        )
+        original[name] = slide(i, image_rids, f"Slide {i}")
+        edited[name] = slide(i, image_rids, f"Slide {i} (edited)")
+        for n in images:
+            original[f"ppt/media/image{n}.png"] = _png()
+
+    original.update(
+        {
+            "[Content_Types].xml": _content_types(overrides),
+            "_rels/.rels": _rels([("rId1", "officeDocument", "ppt/presentation.xml")]),
+            "ppt/_rels/presentation.xml.rels": _rels(presentation_rels),
+            "ppt/presentation.xml": (
+                f"{XML_DECL}<p:presentation {ns}>"
+                f'<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+                f'<p:sldIdLst>{"".join(slide_ids)}</p:sldIdLst>'
+                f'<p:sldSz cx="12192000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/>'
+                f"</p:presentation>"
+            ),
+            "ppt/slideMasters/slideMaster1.xml": (
+                f"{XML_DECL}<p:sldMaster {ns}><p:cSld><p:spTree>{group}</p:spTree></p:cSld>"
+                f'<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" '
+                f'accent2="accent2" accent3="accent3" accent4="accent4" accent5="accent5" '
+                f'accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+                f'<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst>'
+                f"</p:sldMaster>"
+            ),
+            "ppt/slideMasters/_rels/slideMaster1.xml.rels": _rels(
+                [
+                    ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"),
+                    ("rId2", "theme", "../theme/theme1.xml"),
+                ]
+            ),
+            "ppt/slideLayouts/slideLayout1.xml": (
+                f'{XML_DECL}<p:sldLayout {ns}><p:cSld name="Blank"><p:spTree>{group}'
+                f"</p:spTree></p:cSld></p:sldLayout>"
+            ),
+            "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _rels(
+                [("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")]
+            ),
+            "ppt/theme/theme1.xml": _theme(),
+        }
+    )
+    changed = {name: edited[name] for name in list(edited)[:changes]}
+    return original, dict(original, **changed)
+
+
+def build_xlsx(sheets=2, rows=1000, changes=10):
+    """Return (original parts, edited parts) of a workbook.
+
+    Each sheet has `rows` rows of numbers and inline strings; the edited copy
+    changes one cell in each of the first `changes` rows of the first sheet.
+    """
+
+    def sheet(edited_rows):
+        data = []
+        for r in range(1, rows + 1):
+            label = f"Row {r}" + (" (edited)" if r <= edited_rows else "")
+            data.append(
+                f'<row r="{r}"><c r="A{r}"><v>{r}</v></c><c r="B{r}"><v>{r * 0.5}</v></c>'
+                f'<c r="C{r}" t="inlineStr"><is><t>{label}</t></is></c></row>'
+            )
+        return f'{XML_DECL}<worksheet xmlns="{S_NS}"><sheetData>{"".join(data)}</sheetData></worksheet>'
+
+    overrides = {"xl/workbook.xml": "spreadsheetml.sheet.main+xml"}
+    entries = []
+    rels = []
+    original = {}
+    for i in range(1, sheets + 1):
+        name = f"xl/worksheets/sheet{i}.xml"
+        overrides[name] = "spreadsheetml.worksheet+xml"
+        entries.append(f'<sheet name="Sheet{i}" sheetId="{i}" r:id="rId{i}"/>')
+        rels.append((f"rId{i}", "worksheet", f"worksheets/sheet{i}.xml"))
+        original[name] = sheet(0)
+
+    original.update(
+        {
+            "[Content_Types].xml": _content_types(overrides),
+            "_rels/.rels": _rels([("rId1", "officeDocument", "xl/workbook.xml")]),
+            "xl/_rels/workbook.xml.rels": _rels(rels),
+            "xl/workbook.xml": (
+                f'{XML_DECL}<workbook xmlns="{S_NS}" xmlns:r="{R_NS}">'
+                f'<sheets>{"".join(entries)}</sheets></workbook>'
+            ),
+        }
+    )
+    edited = dict(original)
+    if sheets and changes:
+        edited["xl/worksheets/sheet1.xml"] = sheet(changes)
+    return original, edited
+
+
+def write_package(workdir, extension, original, edited):
+    """Write the original file and the unpacked, edited copy; return their paths."""
+    original_file = workdir / f"original{extension}"
+    with zipfile.ZipFile(original_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in original.items():
+            zf.writestr(name, data)
+
+    unpacked_dir = workdir / extension.lstrip(".")
+    for name, data in edited.items():
+        path = unpacked_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data if isinstance(data, bytes) else data.encode("utf-8"))
+    return unpacked_dir, original_file
+
+
+def checks_for(validator_class):
+    """Names of the validator's validate_* checks that take no arguments."""
+    names = []
+    for name, method in inspect.getmembers(validator_class, inspect.isfunction):
+        if not name.startswith("validate_"):
+            continue
+        params = list(inspect.signature(method).parameters.values())[1:]
+        if all(p.default is not p.empty for p in params):
+            names.append(name)
+    return names
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_check(validator_class, unpacked_dir, original_file, check, cache_dir, profile_file):
+    """Worker: construct a validator and time one method on it.
+
+    Runs in a fresh process, so the peak RSS and parse count belong to this
+    check alone. Validator output is discarded.
+    """
+    # Keep the persistent XSD cache of other runs out of the measurement
+    original_module.CACHE_DIR = Path(cache_dir)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator = validator_class(unpacked_dir, original_file)
+        baseline = _peak_rss_mb()
+        profiler = cProfile.Profile() if profile_file else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            passed = getattr(validator, check)()
+        finally:
+            if profiler:
+                profiler.disable()
+        seconds = time.perf_counter() - start
+
+    if profiler:
+        profiler.dump_stats(profile_file)
+    peak = _peak_rss_mb()
+    return {
+        "seconds": seconds,
+        "peak_rss_mb": peak,
+        "rss_growth_mb": None if peak is None else peak - baseline,
+        "parses": getattr(validator, "parse_count", None),
+        "passed": passed,
+    }
+
+
+def run_check(validator_class, unpacked_dir, original_file, check, workdir, repeat, profile_dir):
+    """Run one check `repeat` times, each in a new process; keep the fastest run."""
+    best = None
+    for attempt in range(repeat):
+        cache_dir = tempfile.mkdtemp(dir=workdir, prefix="cache-")
+        profile_file = None
+        if profile_dir and attempt == 0:
+            profile_file = str(
+                Path(profile_dir)
+                / f"{unpacked_dir.name}-{validator_class.__name__}-{check}.prof"
+            )
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(
+                _run_check,
+                validator_class,
+                unpacked_dir,
+                original_file,
+                check,
+                cache_dir,
+                profile_file,
+            ).result()
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def benchmark(args, workdir):
+    """Build each requested package and run its checks. Returns the results."""
+    packages = {
+        "docx": (
+            ".docx",
+            lambda: build_docx(args.paragraphs, args.tracked_changes, args.media),
+            [DOCXSchemaValidator, RedliningValidator],
+        ),
+        "pptx": (
+            ".pptx",
+            lambda: build_pptx(args.slides, args.changes, args.media),
+            [PPTXSchemaValidator],
+        ),
+        # No xlsx validator exists yet; run the generic checks
+        "xlsx": (
+            ".xlsx",
+            lambda: build_xlsx(args.sheets, args.rows, args.changes),
+            [BaseSchemaValidator],
+        ),
+    }
+
+    results = []
+    for fmt in args.formats:
+        extension, build, validator_classes = packages[fmt]
+        unpacked_dir, original_file = write_package(workdir, extension, *build())
+        for validator_class in validator_classes:
+            checks = checks_for(validator_class)
+            # The full run, where the checks share parsed trees
+            if validator_class is not BaseSchemaValidator:
+                checks.append("validate")
+            for check in checks:
+                result = run_check(
+                    validator_class,
+                    unpacked_dir,
+                    original_file,
+                    check,
+                    workdir,
+                    args.repeat,
+                    args.profile,
+                )
+                result.update(
+                    format=fmt, validator=validator_class.__name__, check=check
+                )
+                results.append(result)
+                print_result(result)
+    return results
+
+
+def _key(result):
+    return f"{result['format']}/{result['validator']}.{result['check']}"
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_result(result):
+    status = "ok" if result["passed"] else "FAIL"
+    print(
+        f"{_key(result):<64} {result['seconds'] * 1000:>9.1f} ms"
+        f" {_fmt(result['peak_rss_mb'], '>8.1f')} MB"
+        f" {_fmt(result['rss_growth_mb'], '>+8.1f')} MB"
+        f" {_fmt(result['parses'], '>6')} parses  {status}"
+    )
+
+
+def compare(results, baseline_file, tolerance):
+    """Print checks that got slower than the baseline; return True if none did."""
+    baseline = {
+        _key(result): result
+        for result in json.loads(Path(baseline_file).read_text())["results"]
+    }
+    regressions = []
+    for result in results:
+        before = baseline.get(_key(result))
+        if before is None:
+            continue
+        limit = max(before["seconds"] * tolerance, before["seconds"] + NOISE_FLOOR)
+        if result["seconds"] > limit:
+            regressions.append(
+                f"  {_key(result)}: {before['seconds'] * 1000:.1f} ms -> "
+                f"{result['seconds'] * 1000:.1f} ms"
+            )
+        if before["passed"] != result["passed"]:
+            regressions.append(
+                f"  {_key(result)}: passed {before['passed']} -> {result['passed']}"
+            )
+
+    if regressions:
+        print(f"\nREGRESSIONS against {baseline_file}:")
+        for regression in regressions:
+            print(regression)
+        return False
+    print(f"\nNo regressions against {baseline_file}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Office document validators"
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["docx", "pptx", "xlsx"],
+        default=["docx", "pptx", "xlsx"],
+        help="Package types to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--paragraphs", type=int, default=2000, help="Paragraphs per .docx (default: 2000)"
+    )
+    parser.add_argument(
+        "--tracked-changes",
+        type=int,
+        default=200,
+        help="Tracked changes in the edited .docx (default: 200)",
+    )
+    parser.add_argument(
+        "--slides", type=int, default=50, help="Slides per .pptx (default: 50)"
+    )
+    parser.add_argument(
+        "--media",
+        type=int,
+        default=20,
+        help="Images per .docx and .pptx (default: 20)",
+    )
+    parser.add_argument(
+        "--sheets", type=int, default=2, help="Worksheets per .xlsx (default: 2)"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=2000, help="Rows per worksheet (default: 2000)"
+    )
+    parser.add_argument(
+        "--changes",
+        type=int,
+        default=10,
+        help="Slides or rows edited in the .pptx and .xlsx copies (default: 10)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per check; the fastest is reported (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="Write cProfile stats for each check to DIR (view with python -m pstats)",
+    )
+    parser.add_argument("--save", metavar="FILE", help="Write the results as JSON")
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="Fail if a check is slower than in a JSON file written by --save",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Allowed slowdown factor for --compare (default: 1.25)",
+    )
+    parser.add_argument(
+        "--keep",
+        metavar="DIR",
+        help="Build the packages in DIR and keep them (default: a temporary directory)",
+    )
+    args = parser.parse_args()
+
+    if args.profile:
+        Path(args.profile).mkdir(parents=True, exist_ok=True)
+    workdir = Path(args.keep or tempfile.mkdtemp(prefix="ooxml-benchmark-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    print(
+        f"{'check':<64} {'wall':>12} {'peak RSS':>11} {'growth':>11} {'':>6}"
+    )
+    try:
+        results = benchmark(args, workdir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save:
+        Path(args.save).write_text(
+            json.dumps({"options": vars(args), "results": results}, indent=2)
+        )
+        print(f"\nResults written to {args.save}")
+
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,23 @@ Validator for tracked changes in Word documents.
 
 import subprocess
 import tempfile
-import zipfile
 from pathlib import Path
 
+from .original import OriginalPackage
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
+    # The only part this validator reads (see ValidationSession)
+    PARTS = ("word/document.xml",)
+
     def __init__(self, unpacked_dir, original_docx, verbose=False):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        # Original text without Claude's tracked changes, reused by later runs
+        self._original_text = None
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
@@ -28,11 +34,12 @@ class RedliningValidator:
             return False
 
         # First, check if there are any tracked changes by Claude to validate
+        modified_root = None
         try:
             import xml.etree.ElementTree as ET
 
             tree = ET.parse(modified_file)
-            root = tree.getroot()
+            root = modified_root = tree.getroot()
 
             # Check for w:del or w:ins tags authored by Claude
             del_elements = root.findall(".//w:del", self.namespaces)
@@ -60,56 +67,67 @@ class RedliningValidator:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
+        if self._original_text is None:
+            self._original_text = self._load_original_text()
+            if self._original_text is None:
                 return False
+        original_text = self._original_text
 
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
+        # Parse the modified file for redlining validation (unless done above)
+        try:
+            import xml.etree.ElementTree as ET
 
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
+            if modified_root is None:
+                modified_root = ET.parse(modified_file).getroot()
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+        # Remove Claude's tracked changes and extract text content
+        self._remove_claude_tracked_changes(modified_root)
+        modified_text = self._extract_text_content(modified_root)
+
+        if modified_text != original_text:
+            # Show detailed character-level differences for each paragraph
+            error_message = self._generate_detailed_diff(
+                original_text, modified_text
+            )
+            print(error_message)
+            return False
 
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+    def _load_original_text(self):
+        """Text of the original document.xml without Claude's tracked changes.
 
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        Returns None (after printing why) if it cannot be read.
+        """
+        # Read the original document.xml straight from the docx (no extraction)
+        original = OriginalPackage(self.original_docx)
+        try:
+            original_xml = original.read("word/document.xml")
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return None
+        finally:
+            original.close()
+
+        if original_xml is None:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return None
+
+        try:
+            import xml.etree.ElementTree as ET
+
+            original_root = ET.fromstring(original_xml)
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return None
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        self._remove_claude_tracked_changes(original_root)
+        return self._extract_text_content(original_root)
 
     def _generate_detailed_diff(self, original_text, modified_text):
         """Generate detailed word-level differences using git word diff."""
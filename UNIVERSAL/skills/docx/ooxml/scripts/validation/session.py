@@ -0,0 +1,96 @@
+"""
+Validators kept alive across repeated validations of one unpacked document.
+"""
+
+from pathlib import Path
+
+from .base import BaseSchemaValidator
+from .docx import DOCXSchemaValidator
+from .pptx import PPTXSchemaValidator
+from .redlining import RedliningValidator
+
+# Validators run for each file type, in order
+VALIDATORS = {
+    ".docx": [DOCXSchemaValidator, RedliningValidator],
+    ".pptx": [PPTXSchemaValidator],
+}
+
+
+class ValidationSession:
+    """Resident validators for an editing session on one unpacked document.
+
+    The first validate() is a full run. Later runs are told which parts were
+    written since (package part names, e.g. "word/document.xml") and reuse
+    everything else: compiled schemas, data read from the original file, and
+    the parsed trees and XSD results of unchanged parts. A validator that
+    passed last time and reads none of the changed parts is not run again.
+
+    Usage:
+        session = ValidationSession("unpacked", "original.docx")
+        session.validate()
+        ...  # edit word/document.xml
+        session.validate(changed={"word/document.xml"})
+    """
+
+    def __init__(self, unpacked_dir, original_file, verbose=False):
+        self.unpacked_dir = Path(unpacked_dir)
+        self.original_file = Path(original_file)
+        file_extension = self.original_file.suffix.lower()
+        if file_extension not in VALIDATORS:
+            raise ValueError(f"Validation not supported for file type {file_extension}")
+        self.validators = [
+            V(self.unpacked_dir, self.original_file, verbose=verbose)
+            for V in VALIDATORS[file_extension]
+        ]
+        self._passed = {}  # validator -> result of its last run
+        # validator -> parts changed since its last run (None: unknown)
+        self._changes = {}
+
+    def validate(self, changed=None):
+        """Run the validators, stopping at the first failure.
+
+        Args:
+            changed: Names of the parts written since the last call, or None
+                if unknown (everything is revalidated).
+
+        Returns:
+            The validator that failed, or None if all passed.
+        """
+        # Validators skipped after a failure still see these changes next time
+        for validator in self.validators:
+            pending = self._changes.get(validator, set())
+            if changed is None or pending is None:
+                self._changes[validator] = None
+            else:
+                self._changes[validator] = pending | set(changed)
+
+        for validator in self.validators:
+            if not self._needs_run(validator):
+                continue
+
+            if validator in self._passed and isinstance(validator, BaseSchemaValidator):
+                validator.refresh(self._changes[validator])
+            self._changes[validator] = set()
+            self._passed[validator] = validator.validate()
+            if not self._passed[validator]:
+                return validator
+        return None
+
+    def _needs_run(self, validator):
+        changes = self._changes[validator]
+        if changes is None or not self._passed.get(validator):
+            return True
+        # PARTS lists the parts a validator reads; schema validators read all
+        parts = getattr(validator, "PARTS", None)
+        return bool(changes if parts is None else changes.intersection(parts))
+
+    def close(self):
+        """Release the original file held open by the validators."""
+        for validator in self.validators:
+            original = getattr(validator, "original", None)
+            if original is not None:
+                original.close()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
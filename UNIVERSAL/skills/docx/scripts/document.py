@@ -26,6 +26,7 @@ Usage:
     doc.save()
 """
 
+import hashlib
 import html
 import random
 import shutil
@@ -35,8 +36,8 @@ from pathlib import Path
 
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
-from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
+from ooxml.scripts.validation.session import ValidationSession
 
 from .utilities import XMLEditor
 
@@ -658,6 +659,10 @@ class Document:
         # Cache for lazy-loaded editors
         self._editors = {}
 
+        # Resident validators, created on first validate() (see _modified_parts)
+        self._validation = None
+        self._validated_digests = {}
+
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
         self.comments_extended_path = self.word_path / "commentsExtended.xml"
@@ -832,6 +837,8 @@ class Document:
 
     def __del__(self):
         """Clean up temporary directory on deletion."""
+        if getattr(self, "_validation", None) is not None:
+            self._validation.close()
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
@@ -839,22 +846,26 @@ class Document:
         """
         Validate the document against XSD schema and redlining rules.
 
+        The validators stay alive between calls: after the first run, only
+        parts whose editors changed them since the last validation are
+        parsed and schema-checked again.
+
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
-        schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
+        changed = self._modified_parts()
 
-        # Run validations
-        if not schema_validator.validate():
-            raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
+        if self._validation is None:
+            self._validation = ValidationSession(
+                self.unpacked_path, self.original_docx, verbose=False
+            )
+            changed = None  # First run validates everything
+
+        failed = self._validation.validate(changed)
+        if isinstance(failed, RedliningValidator):
             raise ValueError("Redlining validation failed")
+        if failed is not None:
+            raise ValueError("Schema validation failed")
 
     def save(self, destination=None, validate=True) -> None:
         """
@@ -883,6 +894,16 @@ class Document:
         target_path = Path(destination) if destination else self.original_path
         shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
 
+    def _modified_parts(self):
+        """Editor parts whose saved content changed since the last call."""
+        modified = set()
+        for xml_path, editor in self._editors.items():
+            digest = hashlib.sha1(editor.xml_path.read_bytes()).hexdigest()
+            if self._validated_digests.get(xml_path) != digest:
+                self._validated_digests[xml_path] = digest
+                modified.add(xml_path)
+        return modified
+
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
@@ -2,11 +2,49 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import os
+import posixpath
 import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .original import OriginalPackage, canonical_hash
+from .rules import ANY, Rule, scan_part
+
+# Compiled XSD schemas keyed by schema path, shared by every validator in the
+# process (compiling wml.xsd and its imports is the expensive part of XSD checks)
+_SCHEMA_CACHE = {}
+
+# Validator owned by each worker process in parallel XSD validation
+_WORKER_VALIDATOR = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, schema_paths):
+    """Pool initializer: build one validator per worker and precompile its schemas."""
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = validator_class(unpacked_dir, original_file)
+    _WORKER_VALIDATOR.original.load_cache()
+    for schema_path in schema_paths:
+        try:
+            BaseSchemaValidator._load_schema(schema_path)
+        except Exception:
+            pass  # Reported per file by _validate_single_file_xsd
+
+
+def _validate_file_in_worker(xml_file):
+    """Returns (part name, XSD result, the original part's XSD errors or None).
+
+    The original's error set is sent back so that the parent can merge it into
+    its OriginalPackage and persist it (see OriginalPackage.save_cache).
+    """
+    validator = _WORKER_VALIDATOR
+    result = validator.validate_file_against_xsd(xml_file)
+    name = validator._part_name(xml_file)
+    return name, result, validator.original.xsd_errors.get(name)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,27 +141,209 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self, unpacked_dir, original_file, verbose=False, jobs=1, incremental=False
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Worker processes for XSD validation (0 = one per CPU)
+        self.jobs = jobs or os.cpu_count() or 1
+        # Only check parts that differ from the original (see _is_changed)
+        self.incremental = incremental
+        self._changed = None
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.original = OriginalPackage(self.original_file, self.schemas_dir)
 
-        # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        # Every file in the package, from one directory walk (see _index_files),
+        # and all XML and .rels files
+        self.files = self._index_files()
+        self.xml_files = self._find_xml_files()
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks (see _parse)
+        self._trees = {}
+        self.parse_count = 0
+        # XSD results per file, kept across runs until the file changes (see refresh)
+        self._xsd_results = {}
+        # Single-pass structural rules, run on first use (see _rule_errors)
+        self._rules = None
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _index_files(self):
+        """Map each file's path relative to unpacked_dir to its (size, mtime_ns).
+
+        A single os.scandir walk, in the same order as Path.rglob, so that the
+        file checks run against this in-memory index instead of the disk.
+        """
+        files = {}
+        pending = [("", self.unpacked_dir)]
+        while pending:
+            prefix, directory = pending.pop()
+            subdirs = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirs.append((prefix + entry.name + "/", entry.path))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[prefix + entry.name] = (stat.st_size, stat.st_mtime_ns)
+            # Visit subdirectories depth-first, in directory order
+            pending.extend(reversed(subdirs))
+        return files
+
+    def _find_xml_files(self):
+        return [
+            self.unpacked_dir / name
+            for suffix in (".xml", ".rels")
+            for name in self.files
+            if name.endswith(suffix)
+        ]
+
+    def _has_file(self, path):
+        """True if path (inside unpacked_dir) is a file in the package index."""
+        return self._part_name(path) in self.files
+
+    def _glob_files(self, pattern):
+        """Indexed files matching a glob relative to unpacked_dir, like Path.glob."""
+        depth = pattern.count("/")
+        return [
+            self.unpacked_dir / name
+            for name in self.files
+            if name.count("/") == depth and PurePosixPath(name).match(pattern)
+        ]
+
+    def refresh(self, changed=None):
+        """Prepare to validate again after parts of unpacked_dir were edited.
+
+        Args:
+            changed: Names of the parts written since the last run (e.g.
+                "word/document.xml"), or None if unknown, in which case files
+                whose size or modification time changed are treated as edited.
+                Added and removed files are picked up either way.
+
+        Parsed trees and XSD results of the other parts are kept, as are the
+        compiled schemas and everything read from the original file.
+        """
+        previous, self.files = self.files, self._index_files()
+        if changed is None:
+            changed = {
+                name for name, stat in self.files.items() if previous.get(name) != stat
+            }
+        self.xml_files = self._find_xml_files()
+        current = set(self.xml_files)
+        for cache in (self._trees, self._xsd_results):
+            for xml_file in list(cache):
+                if xml_file not in current or self._part_name(xml_file) in changed:
+                    del cache[xml_file]
+        self._changed = None
+        self._rules = None
+
+    def _parse(self, xml_file):
+        """Parse an XML file once per validator and share the tree between checks.
+
+        The returned tree must be treated as read-only; checks that modify it
+        work on a private copy (see _copy_tree). Parse failures are cached and
+        re-raised as well, so broken files are not re-read by every check.
+        """
+        key = Path(xml_file)
+        cached = self._trees.get(key)
+        if cached is None:
+            self.parse_count += 1
+            try:
+                cached = lxml.etree.parse(str(key))
+            except Exception as e:
+                cached = e
+            self._trees[key] = cached
+        if isinstance(cached, Exception):
+            raise cached
+        return cached
+
+    def _make_rules(self):
+        """Single-pass structural checks (see rules.py), keyed by name."""
+        return {
+            "unique_ids": UniqueIdRule(self),
+            "relationship_ids": RelationshipIdRule(self),
+        }
+
+    def _rule_errors(self, name):
+        """Errors found by a rule; the first call runs all rules over every part.
+
+        Parts already parsed by _parse are walked in place; any other part is
+        streamed with element clearing.
+        """
+        if self._rules is None:
+            self._rules = self._make_rules()
+            for xml_file in self.xml_files:
+                tree = self._trees.get(xml_file)
+                if isinstance(tree, Exception):
+                    for rule in self._rules.values():
+                        if rule.begin(xml_file):
+                            rule.fail(tree)
+                    continue
+                scan_part(xml_file, self._rules.values(), tree)
+        return self._rules[name].errors
+
+    def _copy_tree(self, xml_file):
+        """Return a private, mutable copy of the shared tree for an XML file."""
+        return copy.deepcopy(self._parse(xml_file))
+
+    def _part_name(self, path):
+        """Package part name of a file in unpacked_dir, e.g. 'word/document.xml'."""
+        return Path(path).relative_to(self.unpacked_dir).as_posix()
+
+    def _changed_parts(self):
+        """Names of XML parts whose canonical content differs from the original.
+
+        New parts and parts that fail to parse count as changed. Computed once;
+        original-side hashes come from the on-disk cache when available.
+        """
+        if self._changed is None:
+            self.original.load_cache()
+            original_names = self.original.names
+            changed = set()
+            for xml_file in self.xml_files:
+                name = self._part_name(xml_file)
+                if name not in original_names:
+                    changed.add(name)
+                    continue
+                try:
+                    digest = canonical_hash(self._parse(xml_file))
+                except Exception:
+                    changed.add(name)
+                    continue
+                if digest != self.original.part_hash(name):
+                    changed.add(name)
+            self._changed = changed
+            self.original.save_cache()
+            if self.verbose:
+                print(
+                    f"Incremental: {len(changed)} of {len(self.xml_files)} parts "
+                    "changed since the original"
+                )
+        return self._changed
+
+    def _is_changed(self, path):
+        """True if a part needs checking: always, unless running incrementally."""
+        return not self.incremental or self._part_name(path) in self._changed_parts()
+
+    def _files_to_check(self, files=None):
+        """The given files (default: all XML parts) that need per-part checks."""
+        files = self.xml_files if files is None else files
+        return [f for f in files if self._is_changed(f)]
+
+    def _package_files_changed(self):
+        """True if files were added to or removed from the package."""
+        original = {name for name in self.original.names if not name.endswith("/")}
+        return set(self.files) != original
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
@@ -131,7 +351,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -157,9 +377,9 @@ class BaseSchemaValidator:
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._files_to_check():
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -185,84 +405,7 @@ class BaseSchemaValidator:
 
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
-
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors("unique_ids")
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,14 +417,38 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _global_id_xpath(self):
+        """XPath selecting elements with globally unique IDs outside mc:AlternateContent."""
+        names = "|".join(
+            tag
+            for tag, (_, scope) in self.UNIQUE_ID_REQUIREMENTS.items()
+            if scope == "global"
+        )
+        return (
+            f"//*[contains('|{names}|', concat('|', translate(local-name(), "
+            "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '|'))]"
+            "[not(ancestor::mc:AlternateContent)]"
+        )
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
 
+        # Incremental mode: nothing to recheck unless a .rels file changed or
+        # files were added/removed
+        if (
+            self.incremental
+            and not any(f.suffix == ".rels" for f in self._files_to_check())
+            and not self._package_files_changed()
+        ):
+            if self.verbose:
+                print("PASSED - No relationships or package files changed")
+            return True
+
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = [f for f in self.xml_files if f.name.endswith(".rels")]
 
         if not rels_files:
             if self.verbose:
@@ -290,13 +457,12 @@ class BaseSchemaValidator:
 
         # Get all files in the unpacked directory (excluding reference files)
         all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
+        for name in self.files:
+            file_name = posixpath.basename(name)
             if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
+                file_name != "[Content_Types].xml" and not file_name.endswith(".rels")
             ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+                all_files.append(name)
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
@@ -310,10 +476,10 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
+                rels_dir = posixpath.dirname(self._part_name(rels_file))
 
                 # Find all relationships and their targets
                 referenced_files = set()
@@ -330,22 +496,19 @@ class BaseSchemaValidator:
                         # Resolve the target path relative to the .rels file location
                         if rels_file.name == ".rels":
                             # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
+                            base_dir = ""
                         else:
                             # Other .rels files - targets are relative to their parent's parent
                             # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
+                            base_dir = posixpath.dirname(rels_dir)
+
+                        # Normalize the path and check the package index for it
+                        # (absolute targets are not package-relative paths)
+                        target_path = posixpath.normpath(posixpath.join(base_dir, target))
+                        if not target.startswith("/") and target_path in self.files:
+                            referenced_files.add(target_path)
+                            all_referenced_files.add(target_path)
+                        else:
                             broken_refs.append((target, rel.sourceline))
 
                 # Report broken references
@@ -364,8 +527,9 @@ class BaseSchemaValidator:
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
+            for unref_rel_path in sorted(
+                unreferenced_files, key=lambda name: name.split("/")
+            ):
                 errors.append(f"  Unreferenced file: {unref_rel_path}")
 
         if errors:
@@ -390,87 +554,7 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
-
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+        errors = self._rule_errors("relationship_ids")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -525,13 +609,13 @@ class BaseSchemaValidator:
 
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not self._has_file(content_types_file):
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -576,11 +660,15 @@ class BaseSchemaValidator:
             }
 
             # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            all_files = [PurePosixPath(name) for name in self.files]
 
-            # Check all XML files for Override declarations
-            for xml_file in self.xml_files:
+            # Check all XML files for Override declarations (incremental mode:
+            # only changed parts, unless [Content_Types].xml itself changed)
+            if self._is_changed(content_types_file):
+                xml_files = self.xml_files
+            else:
+                xml_files = self._files_to_check()
+            for xml_file in xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
                     "\\", "/"
                 )
@@ -593,7 +681,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -618,9 +706,8 @@ class BaseSchemaValidator:
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            f'  {file_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
                         )
 
         except Exception as e:
@@ -673,7 +760,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +779,16 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        # Unchanged parts cannot have new errors; incremental mode skips them.
+        # Results from an earlier run are reused for files not changed since.
+        xml_files = self._files_to_check()
+        pending = [f for f in xml_files if f not in self._xsd_results]
+        for xml_file, result in zip(pending, self._validate_files_against_xsd(pending)):
+            self._xsd_results[xml_file] = result
+        self.original.save_cache()
+        for xml_file in xml_files:
+            is_valid, new_file_errors = self._xsd_results[xml_file]
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +804,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -722,6 +814,11 @@ class BaseSchemaValidator:
             print(f"Validated {len(self.xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
+            if len(xml_files) < len(self.xml_files):
+                print(
+                    f"  - Unchanged from original (not rechecked): "
+                    f"{len(self.xml_files) - len(xml_files)}"
+                )
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
             print(
@@ -738,6 +835,33 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd over xml_files, in a process pool if jobs > 1.
+
+        Results come back in the order of xml_files regardless of which worker
+        finished first.
+        """
+        if self.jobs <= 1 or len(xml_files) < 2:
+            return [self.validate_file_against_xsd(f, verbose=False) for f in xml_files]
+
+        schema_paths = {self._get_schema_path(f) for f in xml_files} - {None}
+        self.original.load_cache()
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(xml_files)),
+            initializer=_init_xsd_worker,
+            initargs=(type(self), self.unpacked_dir, self.original_file, schema_paths),
+        ) as pool:
+            chunksize = max(1, len(xml_files) // (self.jobs * 4))
+            for name, result, original_errors in pool.map(
+                _validate_file_in_worker, xml_files, chunksize=chunksize
+            ):
+                # Keep the original-side work the workers did for the disk cache
+                if original_errors is not None and name not in self.original.xsd_errors:
+                    self.original.set_xsd_errors(name, original_errors)
+                results.append(result)
+        return results
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -763,54 +887,41 @@ class BaseSchemaValidator:
         return None
 
     def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+        """Remove attributes and elements not in allowed namespaces, in place.
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
-
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
-
-        return lxml.etree.ElementTree(xml_copy)
-
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        A single iterwalk pass: foreign attributes are dropped as elements are
+        entered, and foreign elements are detached without descending into
+        them. The tree is modified, so callers pass a private copy.
+        """
+        allowed = self.OOXML_NAMESPACES
+        root = xml_doc.getroot()
+        to_remove = []
 
-        # Find elements to remove
-        for elem in list(root):
+        walker = lxml.etree.iterwalk(root, events=("start",))
+        for _, elem in walker:
             # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+            tag = elem.tag
+            if not isinstance(tag, str):
                 continue
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+            ns = tag[1 : tag.index("}")] if tag[0] == "{" else None
+            if ns is not None and ns not in allowed and elem is not root:
+                to_remove.append(elem)
+                walker.skip_subtree()
+                continue
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+            foreign = [
+                attr
+                for attr in elem.attrib
+                if attr[0] == "{" and attr[1 : attr.index("}")] not in allowed
+            ]
+            for attr in foreign:
+                del elem.attrib[attr]
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+        for elem in to_remove:
+            elem.getparent().remove(elem)
+
+        return xml_doc
 
     def _preprocess_for_mc_ignorable(self, xml_doc):
         """Preprocess XML to handle mc:Ignorable attribute properly."""
@@ -823,30 +934,50 @@ class BaseSchemaValidator:
 
         return xml_doc
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
-        if not schema_path:
-            return None, None  # Skip file
-
-        try:
-            # Load schema
+    @staticmethod
+    def _load_schema(schema_path):
+        """Return the compiled XSD schema for schema_path, compiling it once per process."""
+        key = str(schema_path)
+        schema = _SCHEMA_CACHE.get(key)
+        if schema is None:
             with open(schema_path, "rb") as xsd_file:
                 parser = lxml.etree.XMLParser()
                 xsd_doc = lxml.etree.parse(
                     xsd_file, parser=parser, base_url=str(schema_path)
                 )
                 schema = lxml.etree.XMLSchema(xsd_doc)
+            _SCHEMA_CACHE[key] = schema
+        return schema
+
+    def _validate_single_file_xsd(self, xml_file, base_path, source=None):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set).
+
+        If source (an OriginalPackage) is given, the file's tree is read from
+        that package at xml_file's path relative to base_path.
+        """
+        schema_path = self._get_schema_path(xml_file)
+        if not schema_path:
+            return None, None  # Skip file
+
+        try:
+            # Load schema
+            schema = self._load_schema(schema_path)
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            # Load and preprocess XML (files in unpacked_dir use the shared tree;
+            # template tag removal makes the one copy that the rest modifies)
+            relative_path = xml_file.relative_to(base_path)
+            if source is not None:
+                xml_doc = source.tree(relative_path.as_posix())
+            elif base_path == self.unpacked_dir:
+                xml_doc = self._parse(xml_file)
+            else:
+                with open(xml_file, "r") as f:
+                    xml_doc = lxml.etree.parse(f)
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -869,39 +1000,35 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read from the original zip in memory; results are memoized
+        on self.original.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        self.original.load_cache()
+        if name not in self.original.xsd_errors:
+            if name not in self.original.names:
                 # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+                errors = set()
+            else:
+                # Validate the specific file in original
+                is_valid, errors = self._validate_single_file_xsd(
+                    self.original.path / relative_path,
+                    self.original.path,
+                    source=self.original,
+                )
+            self.original.set_xsd_errors(name, errors if errors else set())
+        return self.original.xsd_errors[name]
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -917,8 +1044,7 @@ class BaseSchemaValidator:
         template_pattern = re.compile(r"\{\{[^}]*\}\}")
 
         # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+        xml_copy = copy.deepcopy(xml_doc.getroot())
 
         def process_text_content(text, content_type):
             if not text:
@@ -947,5 +1073,186 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+class UniqueIdRule(Rule):
+    """IDs that must be unique within a file or across files.
+
+    See BaseSchemaValidator.UNIQUE_ID_REQUIREMENTS; elements inside
+    mc:AlternateContent are ignored.
+    """
+
+    ALTERNATE_CONTENT = f"{{{BaseSchemaValidator.MC_NAMESPACE}}}AlternateContent"
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.global_ids = {}  # Track globally unique IDs across all files
+        self._requirements = {}  # Clark tag -> (tag, attribute, scope) or None
+
+    def begin(self, xml_file):
+        super().begin(xml_file)
+        self.file_ids = {}  # Track IDs that must be unique within this file
+        self.alternate_depth = 0
+        if self.validator._is_changed(xml_file):
+            return True
+
+        # Unchanged part (incremental mode): only its global IDs matter
+        try:
+            root = self.validator._parse(xml_file).getroot()
+            for elem in root.xpath(
+                self.validator._global_id_xpath(),
+                namespaces={"mc": self.validator.MC_NAMESPACE},
+            ):
+                self.check(elem)
+        except Exception as e:
+            self.fail(e)
+        return False
+
+    def start_handlers(self):
+        return {self.ALTERNATE_CONTENT: self.enter_alternate, ANY: self.check}
+
+    def end_handlers(self):
+        return {self.ALTERNATE_CONTENT: self.leave_alternate}
+
+    def enter_alternate(self, elem):
+        self.alternate_depth += 1
+
+    def leave_alternate(self, elem):
+        self.alternate_depth -= 1
+
+    def _requirement(self, clark_tag):
+        if clark_tag not in self._requirements:
+            # Get the element name without namespace
+            tag = clark_tag.rpartition("}")[2].lower()
+            requirement = self.validator.UNIQUE_ID_REQUIREMENTS.get(tag)
+            self._requirements[clark_tag] = (
+                (tag, *requirement) if requirement else None
+            )
+        return self._requirements[clark_tag]
+
+    def check(self, elem):
+        if self.alternate_depth:
+            return
+        requirement = self._requirement(elem.tag)
+        if requirement is None:
+            return
+        tag, attr_name, scope = requirement
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if attr.rpartition("}")[2].lower() == attr_name:
+                id_value = value
+                break
+        if id_value is None:
+            return
+
+        if scope == "global":
+            # Check global uniqueness
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {self.part}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (self.part, elem.sourceline, tag)
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    f"  {self.part}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {ids[id_value]})"
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
+
+class RelationshipIdRule(Rule):
+    """r:id references that must resolve in the part's .rels file."""
+
+    R_ID = f"{{{BaseSchemaValidator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+
+    def begin(self, xml_file):
+        super().begin(xml_file)
+        # Skip .rels files themselves
+        if xml_file.suffix == ".rels":
+            return False
+
+        # Determine the corresponding .rels file
+        # For dir/file.xml, it's dir/_rels/file.xml.rels
+        rels_file = xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+
+        # Skip if there's no corresponding .rels file (that's okay)
+        validator = self.validator
+        if not validator._has_file(rels_file):
+            return False
+
+        # Incremental mode: skip if neither the part nor its .rels changed
+        if not (validator._is_changed(xml_file) or validator._is_changed(rels_file)):
+            return False
+
+        try:
+            # Parse the .rels file to get valid relationship IDs and their types
+            rels_root = validator._parse(rels_file).getroot()
+        except Exception as e:
+            self.fail(e)
+            return False
+
+        self.rid_to_type = {}
+        for rel in rels_root.findall(
+            f".//{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            rid = rel.get("Id")
+            rel_type = rel.get("Type", "")
+            if rid:
+                # Check for duplicate rIds
+                if rid in self.rid_to_type:
+                    rels_rel_path = rels_file.relative_to(validator.unpacked_dir)
+                    self.errors.append(
+                        f"  {rels_rel_path}: Line {rel.sourceline}: "
+                        f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                    )
+                # Extract just the type name from the full URL
+                type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                self.rid_to_type[rid] = type_name
+        return True
+
+    def start_handlers(self):
+        return {ANY: self.check}
+
+    def fail(self, error):
+        self.errors.append(f"  Error processing {self.part}: {error}")
+
+    def check(self, elem):
+        # Check for r:id attribute (relationship ID)
+        rid_attr = elem.get(self.R_ID)
+        if not rid_attr:
+            return
+        rid_to_type = self.rid_to_type
+        elem_name = elem.tag.rpartition("}")[2]
+
+        # Check if the ID exists
+        if rid_attr not in rid_to_type:
+            self.errors.append(
+                f"  {self.part}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {self.part}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -3,12 +3,9 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
-
-import lxml.etree
 
 from .base import BaseSchemaValidator
+from .rules import Rule
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -69,47 +66,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
         return all_valid
 
+    def _make_rules(self):
+        rules = super()._make_rules()
+        rules.update(
+            whitespace=WhitespaceRule(self),
+            deletions=DeletionRule(self),
+            insertions=InsertionRule(self),
+        )
+        return rules
+
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors("whitespace")
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -126,39 +96,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors("deletions")
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -180,7 +118,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
@@ -194,19 +132,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original zip
+            tree = self.original.tree("word/document.xml")
+            if tree is None:
+                raise FileNotFoundError("word/document.xml not found in original")
+            root = tree.getroot()
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -218,37 +152,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._rule_errors("insertions")
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
@@ -270,5 +174,113 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
 
 
+def _text_preview(text):
+    """Show a preview of the text"""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class DocumentRule(Rule):
+    """A rule for word/document.xml parts only."""
+
+    W_T = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}t"
+    W_DEL = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}del"
+    W_INS = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}ins"
+    W_DEL_TEXT = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}delText"
+
+    def begin(self, xml_file):
+        super().begin(xml_file)
+        # Only check document.xml files
+        return xml_file.name == "document.xml" and self.validator._is_changed(
+            xml_file
+        )
+
+
+class WhitespaceRule(DocumentRule):
+    """w:t elements with leading/trailing whitespace need xml:space='preserve'."""
+
+    XML_SPACE = f"{{{DOCXSchemaValidator.XML_NAMESPACE}}}space"
+
+    def end_handlers(self):
+        return {self.W_T: self.check}
+
+    def check(self, elem):
+        text = elem.text
+        if not text:
+            return
+        # Check if text starts or ends with whitespace
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            # Check if xml:space="preserve" attribute exists
+            if elem.get(self.XML_SPACE) != "preserve":
+                self.errors.append(
+                    f"  {self.part}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+
+class DeletionRule(DocumentRule):
+    """w:t elements must not appear within w:del elements."""
+
+    def begin(self, xml_file):
+        self.del_depth = 0
+        return super().begin(xml_file)
+
+    def start_handlers(self):
+        return {self.W_DEL: self.enter_del}
+
+    def end_handlers(self):
+        return {self.W_DEL: self.leave_del, self.W_T: self.check}
+
+    def enter_del(self, elem):
+        self.del_depth += 1
+
+    def leave_del(self, elem):
+        self.del_depth -= 1
+
+    def check(self, elem):
+        if self.del_depth and elem.text:
+            self.errors.append(
+                f"  {self.part}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+
+class InsertionRule(DocumentRule):
+    """w:delText within w:ins is only allowed if also nested within a w:del."""
+
+    def begin(self, xml_file):
+        self.ins_depth = 0
+        self.del_depth = 0
+        return super().begin(xml_file)
+
+    def start_handlers(self):
+        return {self.W_INS: self.enter_ins, self.W_DEL: self.enter_del}
+
+    def end_handlers(self):
+        return {
+            self.W_INS: self.leave_ins,
+            self.W_DEL: self.leave_del,
+            self.W_DEL_TEXT: self.check,
+        }
+
+    def enter_ins(self, elem):
+        self.ins_depth += 1
+
+    def leave_ins(self, elem):
+        self.ins_depth -= 1
+
+    def enter_del(self, elem):
+        self.del_depth += 1
+
+    def leave_del(self, elem):
+        self.del_depth -= 1
+
+    def check(self, elem):
+        if self.ins_depth and not self.del_depth:
+            self.errors.append(
+                f"  {self.part}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
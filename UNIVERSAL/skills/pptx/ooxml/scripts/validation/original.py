@@ -0,0 +1,225 @@
+"""
+Read-only access to the original Office file that a validation compares against.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+def _default_cache_dir():
+    """$XDG_CACHE_HOME/ooxml-validation (default ~/.cache), private to the user.
+
+    Without a home directory, falls back to a uid-named directory in the
+    temp directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    if os.path.isabs(base):
+        return Path(base) / "ooxml-validation"
+    suffix = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+    return Path(tempfile.gettempdir()) / f"ooxml-validation-cache{suffix}"
+
+
+# Per-original cache of part hashes and XSD error sets, keyed by the original
+# file's content hash and the schemas' hash (see schema_hash). Bump
+# CACHE_VERSION when hashing or XSD checks change.
+CACHE_DIR = _default_cache_dir()
+CACHE_VERSION = 2
+
+# Schema directory -> schema_hash, computed once per process
+_SCHEMA_HASHES = {}
+
+# Drops ignorable whitespace between tags, which pretty-printing (unpack.py)
+# adds, but keeps text content and anything under xml:space="preserve"
+_BLANK_TEXT_PARSER = lxml.etree.XMLParser(remove_blank_text=True)
+
+
+def schema_hash(schemas_dir):
+    """Hash of the names and contents of every file under schemas_dir."""
+    key = Path(schemas_dir)
+    if key not in _SCHEMA_HASHES:
+        h = hashlib.sha256()
+        for path in sorted(p for p in key.rglob("*") if p.is_file()):
+            h.update(path.relative_to(key).as_posix().encode("utf-8") + b"\0")
+            h.update(path.read_bytes())
+        _SCHEMA_HASHES[key] = h.hexdigest()
+    return _SCHEMA_HASHES[key]
+
+
+def _owned_by_user(st):
+    """True if a stat result belongs to the current user (always without uids)."""
+    return not hasattr(os, "getuid") or st.st_uid == os.getuid()
+
+
+def _private_cache_dir(create=False):
+    """True if CACHE_DIR is a directory owned by, and only accessible to, this user.
+
+    Other local users must not be able to plant cache files: a forged entry
+    could mark changed parts as unchanged or hide new XSD errors.
+    """
+    try:
+        if create:
+            CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = CACHE_DIR.lstat()
+        if not stat.S_ISDIR(st.st_mode) or not _owned_by_user(st):
+            return False
+        if st.st_mode & 0o077:
+            os.chmod(CACHE_DIR, 0o700)
+    except OSError:
+        return False
+    return True
+
+
+def canonical_hash(tree):
+    """Hash of a part's canonical XML (C14N), ignoring ignorable whitespace.
+
+    Lets a pretty-printed unpacked part compare equal to its compact original,
+    while edits to significant whitespace (e.g. in <w:t xml:space="preserve">)
+    still change the hash.
+    """
+    root = lxml.etree.fromstring(lxml.etree.tostring(tree), _BLANK_TEXT_PARSER)
+    data = lxml.etree.tostring(root, method="c14n")
+    return hashlib.sha256(data).hexdigest()
+
+
+class OriginalPackage:
+    """Parts of the original .docx/.pptx/.xlsx, read straight from the zip.
+
+    The archive is opened once and members are read into memory on demand,
+    so nothing is extracted to disk. Parsed trees are memoized, and
+    validators memoize per-part XSD error sets in `xsd_errors`. Part hashes
+    and XSD error sets are also persisted on disk (see load_cache/save_cache),
+    so repeated validations against the same original skip that work. With
+    schemas_dir, the cache is also keyed by the schemas it was computed with.
+    """
+
+    def __init__(self, path, schemas_dir=None):
+        self.path = Path(path)
+        self.schemas_dir = schemas_dir
+        self._zip = None
+        self._trees = {}
+        self._file_hash = None
+        self.part_hashes = {}  # part name -> canonical_hash
+        self.xsd_errors = {}  # part name -> set of XSD error messages
+        self._loaded = False
+        self._dirty = False
+
+    @property
+    def zip(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        return self._zip
+
+    @property
+    def names(self):
+        """Set of part names (forward slashes, no leading slash)."""
+        return set(self.zip.namelist())
+
+    def read(self, name):
+        """Return the raw bytes of a part, or None if it is not in the package."""
+        try:
+            return self.zip.read(name)
+        except KeyError:
+            return None
+
+    def tree(self, name):
+        """Return the parsed tree of a part (memoized), or None if it is missing.
+
+        The tree is shared and must be treated as read-only.
+        """
+        if name not in self._trees:
+            data = self.read(name)
+            self._trees[name] = (
+                None if data is None else lxml.etree.ElementTree(lxml.etree.fromstring(data))
+            )
+        return self._trees[name]
+
+    @property
+    def file_hash(self):
+        if self._file_hash is None:
+            h = hashlib.sha256()
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            self._file_hash = h.hexdigest()
+        return self._file_hash
+
+    @property
+    def cache_path(self):
+        key = self.file_hash
+        if self.schemas_dir is not None:
+            key += "-" + schema_hash(self.schemas_dir)[:16]
+        return CACHE_DIR / f"{key}.json"
+
+    def load_cache(self):
+        """Merge previously persisted part hashes and XSD errors (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not _private_cache_dir():
+            return
+        try:
+            with open(self.cache_path, "rb") as f:
+                if not _owned_by_user(os.fstat(f.fileno())):
+                    return
+                cached = json.loads(f.read())
+        except (OSError, ValueError):
+            return
+        if cached.get("version") != CACHE_VERSION:
+            return
+        for name, digest in cached.get("part_hashes", {}).items():
+            self.part_hashes.setdefault(name, digest)
+        for name, errors in cached.get("xsd_errors", {}).items():
+            self.xsd_errors.setdefault(name, set(errors))
+
+    def save_cache(self):
+        """Persist part hashes and XSD errors if anything new was computed."""
+        if not self._dirty:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "part_hashes": self.part_hashes,
+            "xsd_errors": {name: sorted(errors) for name, errors in self.xsd_errors.items()},
+        }
+        if not _private_cache_dir(create=True):
+            return
+        try:
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.cache_path)
+            self._dirty = False
+        except OSError:
+            pass  # The cache is an optimization only
+
+    def set_xsd_errors(self, name, errors):
+        self.xsd_errors[name] = errors
+        self._dirty = True
+
+    def part_hash(self, name):
+        """canonical_hash of a part, or None if it is missing or unparseable."""
+        self.load_cache()
+        if name not in self.part_hashes:
+            try:
+                tree = self.tree(name)
+            except lxml.etree.XMLSyntaxError:
+                tree = None
+            self.part_hashes[name] = canonical_hash(tree) if tree is not None else None
+            self._dirty = True
+        return self.part_hashes[name]
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
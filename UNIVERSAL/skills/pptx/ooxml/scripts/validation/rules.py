@@ -0,0 +1,111 @@
+"""
+Single-pass rule engine for per-element structural checks.
+
+Each Rule maps the tags it is interested in (ANY for every element) to
+start/end callbacks and collects its own error messages. scan_part() walks a part once
+and dispatches every event to the interested rules, so adding a check does
+not add another traversal of the tree.
+"""
+
+from collections import defaultdict
+
+import lxml.etree
+
+# Register for the events of every element
+ANY = "*"
+
+
+class Rule:
+    """A check that runs during the shared pass over each part.
+
+    Subclasses return {tag: callback} dicts (Clark notation, or ANY) from
+    start_handlers/end_handlers. Start callbacks see the element's attributes;
+    text and children are only complete in end callbacks. For each event,
+    callbacks for the specific tag run before ANY callbacks.
+    """
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        self.xml_file = None
+        self.part = None  # xml_file relative to the unpacked directory
+
+    def begin(self, xml_file):
+        """Prepare for a part; return False to skip it."""
+        self.xml_file = xml_file
+        self.part = xml_file.relative_to(self.validator.unpacked_dir)
+        return True
+
+    def start_handlers(self):
+        return {}
+
+    def end_handlers(self):
+        return {}
+
+    def fail(self, error):
+        """Record that the current part could not be scanned."""
+        self.errors.append(f"  {self.part}: Error: {error}")
+
+
+def scan_part(xml_file, rules, tree=None):
+    """Run rules over one part in a single pass.
+
+    With a parsed tree, the tree is walked in place (lxml.etree.iterwalk) and
+    left untouched. Otherwise the file is streamed with lxml.etree.iterparse
+    and each element is cleared once its end event is handled, so memory
+    stays bounded on huge parts. Returns the rules that were run.
+    """
+    rules = [rule for rule in rules if rule.begin(xml_file)]
+    if not rules:
+        return rules
+
+    on_start = defaultdict(list)
+    on_end = defaultdict(list)
+    for rule in rules:
+        for tag, callback in rule.start_handlers().items():
+            on_start[tag].append(callback)
+        for tag, callback in rule.end_handlers().items():
+            on_end[tag].append(callback)
+    start_any = on_start.pop(ANY, [])
+    end_any = on_end.pop(ANY, [])
+
+    if tree is not None:
+        events = lxml.etree.iterwalk(tree, events=("start", "end"))
+    else:
+        events = lxml.etree.iterparse(str(xml_file), events=("start", "end"))
+    clear = tree is None
+
+    try:
+        for event, elem in events:
+            tag = elem.tag
+            # Skip non-element nodes (comments, processing instructions, etc.)
+            if not isinstance(tag, str):
+                continue
+
+            if event == "start":
+                for callback in on_start.get(tag, ()):
+                    callback(elem)
+                for callback in start_any:
+                    callback(elem)
+                continue
+
+            for callback in on_end.get(tag, ()):
+                callback(elem)
+            for callback in end_any:
+                callback(elem)
+            if clear:
+                # Drop the finished subtree and the siblings before it
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+    except Exception as e:
+        for rule in rules:
+            rule.fail(e)
+
+    return rules
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")